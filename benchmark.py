@@ -0,0 +1,675 @@
+"""Benchmarks de todos los caminos de cálculo del informe, sin internet ni Streamlit.
+
+    python benchmark.py                       # todo
+    python benchmark.py dolar valuacion       # sólo algunos grupos
+    python benchmark.py --guardar --comparar  # guarda en .benchmarks/ y compara con la corrida anterior
+
+Los datos de entrada salen de generadores sintéticos con semilla fija
+(precios, lotes, series de dólar con la forma de valores_limpio.csv y
+titulares), así que los resultados son comparables entre commits.
+"""
+import argparse
+import copy
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from cache_precios import CachePrecios
+from carteras import valuar_carteras
+from cotizaciones import MotorCotizaciones, cambios
+from datos import ACTIVOS_EVOLUCION, ProveedorLocal, alinear_cierres
+from dolar import MONEDAS, VENTANAS, SerieDolar
+from graficos import reducir_series
+from ingesta_dolar import AlmacenDolar
+from moviles import VENTANAS_MOVILES, EstadisticasMoviles
+from proyeccion import proyectar
+from riesgo import matriz_retornos, metricas_riesgo
+from servicio_datos import ServicioDatos
+from titulares import CLASIFICADOR, TEMAS, ClasificadorTemas
+from universo import UniversoActivos
+from valuacion import convertir_lotes, convertir_serie, serie_cartera, valuar_lotes
+
+DIRECTORIO_RESULTADOS = ".benchmarks"
+UMBRAL_REGRESION = 0.10
+
+# Mejor tiempo (ms) de cada medición, por "grupo: nombre"
+RESULTADOS = {}
+_grupo = ""
+
+
+def generar_precios(n_tickers, dias=756, semilla=0):
+    # Tabla larga Fecha, Ticker, Close con caminos aleatorios log-normales
+    rng = np.random.default_rng(semilla)
+    fechas = pd.bdate_range(end="2025-05-09", periods=dias)
+    retornos = rng.normal(0.0003, 0.02, size=(dias, n_tickers))
+    precios = 100 * np.exp(np.cumsum(retornos, axis=0))
+    tickers = [f"T{i:05d}" for i in range(n_tickers)]
+    ancho = pd.DataFrame(precios, index=pd.Index(fechas, name="Fecha"), columns=tickers)
+    return ancho.stack().rename("Close").rename_axis(["Fecha", "Ticker"]).reset_index()
+
+
+def generar_lotes(n_lotes, tickers, fechas, semilla=0):
+    rng = np.random.default_rng(semilla)
+    return pd.DataFrame({
+        "Ticker": rng.choice(tickers, size=n_lotes),
+        "Fecha": rng.choice(fechas, size=n_lotes),
+        "Cantidad": rng.integers(1, 100, size=n_lotes).astype(float),
+    })
+
+
+def generar_dolar(dias=2150, semilla=0):
+    """Cotizaciones diarias con las columnas de valores_limpio.csv (sin Brecha).
+
+    El oficial sube con devaluaciones escalonadas, CCL y MEP con una brecha
+    que oscila, y UYU arranca vacío como en el archivo original.
+    """
+    rng = np.random.default_rng(semilla)
+    fechas = pd.date_range(end="2025-05-09", periods=dias, freq="D")
+    # La deriva se reparte en el largo pedido: en series largas el oficial no se sale de float32
+    deriva = 0.0012 * min(1, 2150 / dias)
+    oficial = 40 * np.exp(np.cumsum(rng.normal(deriva, 0.004, size=dias)))
+    brecha = 1 + np.clip(0.5 + np.cumsum(rng.normal(0, 0.02, size=dias)), 0, 2)
+    ccl = oficial * brecha
+    df = pd.DataFrame({
+        "fecha": fechas,
+        "USD CCL": ccl,
+        "USD MEP": ccl * rng.normal(0.98, 0.01, size=dias),
+        "OFICIAL": oficial,
+        "EUR": oficial * 1.08,
+        "UYU": np.where(np.arange(dias) < dias // 3, np.nan, oficial / 40),
+    })
+    # Fines de semana sin cotización, como en el CSV
+    df.loc[df["fecha"].dt.dayofweek >= 5, MONEDAS] = np.nan
+    return df
+
+
+def generar_universo(n, semilla=0):
+    # Tickers de 1 a 5 letras (con sufijo de mercado en algunos) y nombres de empresas
+    rng = np.random.default_rng(semilla)
+    letras = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+    palabras = ("Global Capital Holdings Bank Energy Tech Pharma Mining Industries Group Systems "
+                "Partners Société Générale Compañía Minera Acero Petróleo Financial Motors").split()
+    sufijos = np.array(["", "", "", ".BA", ".L", ".DE", "-USD"])
+    tickers = ["".join(rng.choice(letras, size=rng.integers(1, 6))) + f"{i}" + rng.choice(sufijos) for i in range(n)]
+    nombres = [" ".join(rng.choice(palabras, size=rng.integers(1, 4))) + f" {i}" for i in range(n)]
+    return pd.DataFrame({"Ticker": tickers, "Nombre": nombres})
+
+
+def generar_titulares(n, semilla=0):
+    rng = np.random.default_rng(semilla)
+    palabras = ("el la de del en por y mercado gobierno acciones bonos empresas anuncio semana "
+                "dólar inflación tasa BCRA soja petróleo récord caída crisis tasación precios").split()
+    largos = rng.integers(6, 14, size=n)
+    return [" ".join(rng.choice(palabras, size=k)).capitalize() for k in largos]
+
+
+def titulo(texto):
+    # Encabezado de un grupo de mediciones; también forma parte de la clave de RESULTADOS
+    global _grupo
+    _grupo = texto
+    print(texto)
+
+
+def medir(nombre, funcion, repeticiones=5):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    mejor = min(tiempos) * 1000
+    RESULTADOS[f"{_grupo}: {nombre.strip()}"] = mejor
+    print(f"{nombre:<45} {mejor:>10.2f} ms")
+    return mejor
+
+
+def bench_evolucion(latencia=0.05):
+    proveedor = ProveedorLocal.desde_csv(latencia=latencia)
+    tickers = list(ACTIVOS_EVOLUCION.values())
+
+    # Versión anterior: un pedido por activo y merge de a pares
+    def por_activo():
+        df_merged = None
+        for ticker in tickers:
+            data = proveedor.historiales([ticker], "max").dropna().reset_index()
+            if data.empty:
+                continue
+            df_merged = data if df_merged is None else pd.merge(df_merged, data, on="Fecha", how="outer")
+        return df_merged.sort_values("Fecha").ffill()
+
+    def en_lote():
+        return alinear_cierres(proveedor.historiales(tickers, "max"))
+
+    titulo(f"Evolución de activos ({len(tickers)} activos, latencia simulada {latencia * 1000:.0f} ms)")
+    medir("  un pedido por activo + merge", por_activo, repeticiones=2)
+    medir("  descarga en lote", en_lote, repeticiones=2)
+
+
+def bench_cache_precios(latencia=0.05):
+    tickers = list(ACTIVOS_EVOLUCION.values())
+    with tempfile.TemporaryDirectory() as directorio:
+        proveedor = ProveedorLocal.desde_csv(latencia=latencia)
+        titulo(f"Cache de precios en disco ({len(tickers)} activos, latencia simulada {latencia * 1000:.0f} ms)")
+        # Una sola repetición: a partir de la segunda la cache ya está caliente
+        cache = CachePrecios(proveedor, directorio=directorio)
+        medir("  en frío", lambda: cache.historiales(tickers, "max"), repeticiones=1)
+        medir("  en caliente (dentro del TTL)", lambda: cache.historiales(tickers, "max"), repeticiones=1)
+        cache.ttl = pd.Timedelta(0)
+        medir("  en caliente (pidiendo sólo la cola)", lambda: cache.historiales(tickers, "max"), repeticiones=1)
+        # Nueva instancia sobre el mismo directorio, como tras reiniciar la app
+        cache = CachePrecios(proveedor, directorio=directorio)
+        medir("  tras reiniciar el proceso", lambda: cache.historiales(tickers, "max"), repeticiones=1)
+        print(f"  pedidos al proveedor: {proveedor.pedidos}")
+
+
+def bench_cotizaciones(latencia=0.05):
+    proveedor = ProveedorLocal.desde_csv(latencia=latencia)
+    tickers = [t for t in ACTIVOS_EVOLUCION.values() if t in proveedor.precios.columns]
+
+    def en_serie():
+        # Versión anterior: .info una vez para las métricas y otra para la info extendida
+        for _ in range(2):
+            for ticker in tickers:
+                proveedor.cotizacion(ticker)
+
+    def en_paralelo():
+        motor = MotorCotizaciones(proveedor)
+        motor.instantanea(tickers)
+        motor.instantanea(tickers)
+
+    titulo(f"Cotizaciones ({len(tickers)} activos, latencia simulada {latencia * 1000:.0f} ms)")
+    medir("  en serie, dos veces por activo", en_serie, repeticiones=1)
+    medir("  instantánea en paralelo + TTL", en_paralelo, repeticiones=1)
+
+
+def bench_tablero(tamanios=(10, 100, 1000), cambian=0.1):
+    titulo(f"Tablero en vivo (instantánea desde cache, cambia el {cambian:.0%} de los precios)")
+    rng = np.random.default_rng(0)
+    for n in tamanios:
+        anterior = pd.DataFrame({
+            "precio": rng.uniform(10, 500, size=n), "cierre": rng.uniform(10, 500, size=n),
+            "volumen": rng.integers(1, 10 ** 6, size=n).astype(float), "error": None,
+        }, index=pd.Index([f"T{i:04d}" for i in range(n)], name="Ticker"))
+        actual = anterior.copy()
+        movidos = rng.choice(n, size=max(1, int(n * cambian)), replace=False)
+        actual.iloc[movidos, 0] *= 1.01
+
+        # Sin comparar: se vuelven a formatear todas las métricas
+        def todas():
+            return [f"${p:,.2f} {(p - c) / c * 100:+.2f}%" for p, c in zip(actual["precio"], actual["cierre"])]
+
+        def solo_cambios():
+            filas = actual.loc[cambios(anterior, actual)]
+            return [f"${p:,.2f} {(p - c) / c * 100:+.2f}%" for p, c in zip(filas["precio"], filas["cierre"])]
+
+        medir(f"  {n:>5} tickers, formatear todas", todas, repeticiones=5)
+        medir(f"  {n:>5} tickers, comparar y formatear cambios", solo_cambios, repeticiones=5)
+
+    # El cuerpo completo del fragmento (instantánea, comparación y una métrica por ticker)
+    # sólo se puede medir con Streamlit instalado
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("  (sin streamlit no se mide el fragmento completo)")
+        return
+
+    def fragmento(cantidad):
+        import os
+
+        os.environ["INFORME_PROVEEDOR"] = "local"
+        from secciones.precios import tablero_en_vivo
+        from secciones.recursos import obtener_universo
+
+        universo = obtener_universo()
+        tablero_en_vivo(universo.tickers.tolist()[:cantidad], universo)
+
+    for n in (10, 100):
+        app = AppTest.from_function(fragmento, args=(n,), default_timeout=60)
+        app.run()
+        medir(f"  {n:>5} tickers, fragmento completo sin cambios", app.run, repeticiones=5)
+
+
+def bench_servicio_datos(sesiones=20, latencia=0.2):
+    tickers = ["GOOGL", "AAPL", "TSLA"]
+
+    def rerun(proveedor):
+        # Todas las sesiones piden los activos por defecto de "Evolución de activos" a la vez
+        with ThreadPoolExecutor(max_workers=sesiones) as pool:
+            list(pool.map(lambda _: proveedor.historiales(tickers, "365d"), range(sesiones)))
+
+    titulo(f"Servicio de datos compartido ({sesiones} sesiones simultáneas, latencia simulada {latencia * 1000:.0f} ms)")
+    directo = ProveedorLocal.desde_csv(latencia=latencia)
+    medir("  cada sesión llama al proveedor", lambda: rerun(directo), repeticiones=1)
+    compartido = ProveedorLocal.desde_csv(latencia=latencia)
+    servicio = ServicioDatos(compartido)
+    medir("  pedidos agrupados (cache fría)", lambda: rerun(servicio), repeticiones=1)
+    medir("  pedidos agrupados (cache caliente)", lambda: rerun(servicio), repeticiones=1)
+    estadisticas = servicio.estadisticas()
+    print(f"  pedidos al proveedor: {directo.pedidos} directo, {compartido.pedidos} compartido "
+          f"({estadisticas['coalescidos']} agrupados, {estadisticas['aciertos']} aciertos)")
+
+
+def bench_alineacion(tamanios=(16, 100, 500), dias=2520):
+    titulo(f"Alineación de cierres para la evolución ({dias} días, sin latencia)")
+    precios = generar_precios(max(tamanios), dias=dias)
+    ancho = precios.pivot(index="Fecha", columns="Ticker", values="Close")
+    # Acciones sin fines de semana y cripto todos los días: huecos como los de Yahoo
+    completo = ancho.reindex(pd.date_range(ancho.index.min(), ancho.index.max(), name="Fecha"))
+    completo.iloc[:, ::4] = completo.iloc[:, ::4].interpolate(limit_area="inside")
+    for n in tamanios:
+        cierres = completo.iloc[:, :n]
+
+        # Versión anterior: un DataFrame por activo y merge de a pares
+        def merge_de_a_pares():
+            df_merged = None
+            for ticker in cierres.columns:
+                data = cierres[ticker].dropna().rename(ticker).reset_index()
+                df_merged = data if df_merged is None else pd.merge(df_merged, data, on="Fecha", how="outer")
+            return df_merged.sort_values("Fecha").ffill()
+
+        if n <= 100:
+            medir(f"  {n:>4} activos, merge de a pares", merge_de_a_pares, repeticiones=2)
+        medir(f"  {n:>4} activos, alineación en bloque", lambda: alinear_cierres(cierres), repeticiones=3)
+
+
+def bench_valuacion(tamanios=(5, 500, 50000)):
+    precios = generar_precios(500)
+    cierres = precios.pivot(index="Fecha", columns="Ticker", values="Close")
+    fechas = cierres.index[:-20]
+    titulo(f"Valuación de lotes ({len(cierres)} ruedas, {cierres.shape[1]} tickers)")
+    for n in tamanios:
+        lotes = generar_lotes(n, cierres.columns, fechas)
+        lotes["Fecha"] = pd.to_datetime(lotes["Fecha"])
+
+        # Versión anterior: un filtro por fecha para cada lote
+        def por_lote():
+            filas = []
+            for _, row in lotes.iterrows():
+                serie = cierres[row["Ticker"]]
+                compra = serie[(serie.index >= row["Fecha"]) & (serie.index <= row["Fecha"] + pd.Timedelta(days=4))]
+                if not compra.empty:
+                    filas.append((compra.iloc[0], serie.iloc[-1]))
+            return filas
+
+        if n <= 500:
+            medir(f"  {n:>6} lotes, filtro por lote", por_lote, repeticiones=1)
+        medir(f"  {n:>6} lotes, merge_asof", lambda: valuar_lotes(lotes, cierres), repeticiones=3)
+
+
+def bench_carteras(tamanios=(100, 1000, 10000), lotes_por_cartera=8):
+    precios = generar_precios(500)
+    cierres = precios.pivot(index="Fecha", columns="Ticker", values="Close")
+    fechas = cierres.index[:-20]
+    titulo(f"Valuación en lote de carteras ({lotes_por_cartera} lotes c/u, {cierres.shape[1]} tickers)")
+    for n in tamanios:
+        lotes = generar_lotes(n * lotes_por_cartera, cierres.columns, fechas)
+        lotes["Fecha"] = pd.to_datetime(lotes["Fecha"])
+        lotes.insert(0, "Cartera", np.repeat([f"cliente_{i:05d}" for i in range(n)], lotes_por_cartera))
+
+        # Una valuación completa por cartera, como al subirlas de a una en la app
+        def de_a_una():
+            for _, cartera in lotes.groupby("Cartera"):
+                valuar_lotes(cartera.drop(columns="Cartera"), cierres[cartera["Ticker"].unique()])
+
+        if n <= 1000:
+            t = medir(f"  {n:>6} carteras, de a una", de_a_una, repeticiones=1)
+            print(f"  {'':>6} {n / (t / 1000):,.0f} carteras/s")
+        t = medir(f"  {n:>6} carteras, vectorizado", lambda: valuar_carteras(lotes, cierres, procesos=1), repeticiones=1)
+        print(f"  {'':>6} {n / (t / 1000):,.0f} carteras/s")
+        t = medir(f"  {n:>6} carteras, vectorizado en 4 procesos", lambda: valuar_carteras(lotes, cierres, procesos=4), repeticiones=1)
+        print(f"  {'':>6} {n / (t / 1000):,.0f} carteras/s")
+
+
+def bench_serie_cartera(tamanios=(5, 50, 500, 5000)):
+    precios = generar_precios(500)
+    tickers = precios["Ticker"].unique()
+    fechas = precios["Fecha"].unique()[:-20]
+    cierres = precios.pivot(index="Fecha", columns="Ticker", values="Close")
+
+    titulo(f"Histórico de cartera ({len(fechas) + 20} ruedas, hasta {len(tickers)} tickers)")
+    for n in tamanios:
+        lotes = generar_lotes(n, tickers, fechas)
+
+        # Versión anterior: concat dentro del loop de tenencias
+        def con_concat():
+            df_hist_total = pd.DataFrame()
+            for i, row in lotes.iterrows():
+                hist = cierres[row["Ticker"]][cierres.index >= row["Fecha"]] * row["Cantidad"]
+                df_hist_total = pd.concat([df_hist_total, hist.rename(i)], axis=1, sort=True)
+            df_hist_total = df_hist_total.ffill().dropna()
+            return df_hist_total.sum(axis=1)
+
+        if n <= 500:
+            medir(f"  {n:>5} lotes, concat en loop", con_concat, repeticiones=1)
+        medir(f"  {n:>5} lotes, pivot vectorizado", lambda: serie_cartera(precios, lotes), repeticiones=3)
+
+
+def bench_conversion(tamanios=(5, 500, 50000), moneda="ARS (CCL)"):
+    precios = generar_precios(500)
+    cierres = precios.pivot(index="Fecha", columns="Ticker", values="Close")
+    df = generar_dolar(4000).sort_values("fecha").ffill()
+    serie = SerieDolar(df["fecha"].to_numpy(), df[MONEDAS].to_numpy(dtype=np.float32))
+    titulo(f"Conversión de monedas a {moneda} ({len(df)} días de cotizaciones)")
+    for n in tamanios:
+        lotes = generar_lotes(n, cierres.columns, cierres.index[:-20])
+        lotes["Fecha"] = pd.to_datetime(lotes["Fecha"])
+        valuados = valuar_lotes(lotes, cierres)
+
+        # Una búsqueda con máscara booleana por lote
+        def por_lote():
+            return [df[df["fecha"] <= fecha].iloc[-1]["USD CCL"] for fecha in valuados["Fecha"]]
+
+        if n <= 500:
+            medir(f"  {n:>6} lotes, búsqueda por lote", por_lote, repeticiones=1)
+        medir(f"  {n:>6} lotes, join as-of", lambda: convertir_lotes(valuados, serie, moneda), repeticiones=3)
+
+    historico = cierres.iloc[:, :50] * 10
+    medir(f"  histórico {historico.shape[0]} ruedas x {historico.shape[1]} columnas",
+          lambda: convertir_serie(historico, serie, moneda), repeticiones=3)
+
+
+def bench_dolar(ruta="valores_limpio.csv"):
+    titulo(f"Cotización del dólar ({ruta})")
+
+    def cargar_csv():
+        df = pd.read_csv(ruta, parse_dates=["fecha"])
+        df = df.sort_values("fecha").ffill()
+        df["Brecha"] = (df["USD CCL"] / df["OFICIAL"] - 1) * 100
+        return df
+
+    with tempfile.TemporaryDirectory() as directorio:
+        medir("  carga parseando el CSV", cargar_csv)
+        SerieDolar.desde_csv(ruta, directorio_cache=directorio)
+        medir("  carga desde el binario", lambda: SerieDolar.desde_csv(ruta, directorio_cache=directorio))
+
+    df = cargar_csv()
+    serie = SerieDolar.desde_csv(ruta, directorio_cache=None)
+    fechas = pd.to_datetime(np.random.default_rng(0).choice(df["fecha"].to_numpy(), size=1000))
+    medir("  1000 búsquedas con máscara booleana", lambda: [df[df["fecha"] <= f].iloc[-1] for f in fechas], repeticiones=1)
+    medir("  1000 búsquedas con searchsorted", lambda: [serie.cotizacion(f) for f in fechas], repeticiones=1)
+
+
+# Más de ~100.000 días diarios hasta 2025 caen antes de 1677, fuera de datetime64[ns]
+def bench_dolar_sintetico(tamanios=(2150, 20000, 50000)):
+    titulo("Cotización del dólar sintética (forma de valores_limpio.csv)")
+    for dias in tamanios:
+        df = generar_dolar(dias).sort_values("fecha").ffill()
+        fechas = df["fecha"].to_numpy()
+        valores = df[MONEDAS].to_numpy(dtype=np.float32)
+        medir(f"  {dias:>6} días, construir SerieDolar", lambda: SerieDolar(fechas, valores), repeticiones=3)
+        serie = SerieDolar(fechas, valores)
+        consultas = pd.to_datetime(np.random.default_rng(0).choice(fechas, size=1000))
+        medir(f"  {dias:>6} días, 1000 búsquedas as-of", lambda: [serie.cotizacion(f) for f in consultas], repeticiones=3)
+        medir(f"  {dias:>6} días, todas las ventanas", lambda: [serie.ventana(v) for v in VENTANAS], repeticiones=3)
+
+
+def bench_ingesta_dolar(tamanios=(2150, 20000, 50000), nuevas=1):
+    titulo(f"Ingesta de cotizaciones nuevas ({nuevas} fila(s) por día)")
+    for dias in tamanios:
+        df = generar_dolar(dias + 20)
+        historico, dia = df.iloc[:dias], df.iloc[dias:dias + nuevas]
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "valores.csv")
+            historico.to_csv(ruta, index=False)
+
+            # Antes: se reescribe el CSV y se vuelve a limpiar y cargar la serie entera
+            def reprocesar():
+                pd.concat([pd.read_csv(ruta), dia.assign(fecha=dia["fecha"].astype(str))]).to_csv(
+                    os.path.join(directorio, "completo.csv"), index=False)
+                SerieDolar.desde_csv(os.path.join(directorio, "completo.csv"), directorio_cache=None)
+
+            medir(f"  {dias:>6} días, reescribir y recargar", reprocesar, repeticiones=3)
+            almacen = AlmacenDolar.desde_csv(ruta, os.path.join(directorio, "almacen"))
+            almacen.serie()
+            agregados = iter(df.iloc[dias:].itertuples(index=False))
+
+            def ingerir():
+                fila = next(agregados)
+                almacen.agregar(pd.DataFrame([fila], columns=df.columns))
+                almacen.serie()
+
+            medir(f"  {dias:>6} días, agregar un segmento y extender", ingerir, repeticiones=3)
+
+
+def bench_graficos(n_series=16, dias=12000, max_puntos=1500):
+    import plotly.express as px
+
+    precios = generar_precios(n_series, dias=dias)
+    ancho = precios.pivot(index="Fecha", columns="Ticker", values="Close").reset_index()
+    columnas = [c for c in ancho.columns if c != "Fecha"]
+    tamanios = {}
+
+    def sin_reducir():
+        largo = ancho.melt(id_vars="Fecha", var_name="Activo", value_name="Valor")
+        tamanios["sin"] = len(px.line(largo, x="Fecha", y="Valor", color="Activo").to_json())
+
+    def reducido(metodo):
+        largo = reducir_series(ancho, "Fecha", columnas, max_puntos, var_name="Activo", value_name="Valor", metodo=metodo)
+        tamanios[metodo] = len(px.line(largo, x="Fecha", y="Valor", color="Activo").to_json())
+
+    titulo(f"Gráfico de líneas ({n_series} series x {dias} puntos, máximo {max_puntos} por serie)")
+    medir("  melt + px.line + JSON", sin_reducir, repeticiones=2)
+    medir("  min/max + px.line + JSON", lambda: reducido("minmax"), repeticiones=2)
+    medir("  LTTB + px.line + JSON", lambda: reducido("lttb"), repeticiones=2)
+    print(f"  JSON enviado: {tamanios['sin'] / 1e6:.2f} MB sin reducir, "
+          f"{tamanios['minmax'] / 1e6:.2f} MB min/max, {tamanios['lttb'] / 1e6:.2f} MB LTTB")
+
+
+def bench_universo(tamanios=(100, 10000, 50000)):
+    titulo("Universo de activos: índice y búsqueda")
+    consultas = ["AB", "energy tech", "holdngs", "societe", "pharma group"]
+    for n in tamanios:
+        df = generar_universo(n).sort_values("Nombre")
+
+        # Versión anterior: listas de opciones y mapa de nombres con iterrows en cada rerun
+        def con_iterrows():
+            opciones = [f"{row['Ticker']} - {row['Nombre']}" for _, row in df.iterrows()]
+            nombres = {row['Ticker']: row['Nombre'] for _, row in df.iterrows()}
+            return opciones, nombres
+
+        if n <= 10000:
+            medir(f"  {n:>6} activos, opciones con iterrows", con_iterrows, repeticiones=1)
+        medir(f"  {n:>6} activos, construir índice (una vez)", lambda: UniversoActivos(df["Ticker"], df["Nombre"]), repeticiones=1)
+        universo = UniversoActivos(df["Ticker"], df["Nombre"])
+        medir(f"  {n:>6} activos, {len(consultas)} búsquedas", lambda: [universo.buscar(c) for c in consultas])
+
+
+def bench_titulares(tamanios=(1000, 10000, 100000)):
+    # Taxonomía grande: 50 temas con 20 palabras clave cada uno, además de TEMAS
+    grande = dict(TEMAS, **{f"Tema {i}": [f"clave{i}x{j}" for j in range(20)] for i in range(50)})
+    casos = [(TEMAS, CLASIFICADOR, tamanios), (grande, ClasificadorTemas(grande), tamanios[:2])]
+
+    for temas, clasificador, tamanios_caso in casos:
+        titulo(f"Clasificación de titulares ({sum(len(p) for p in temas.values())} palabras clave)")
+        for n in tamanios_caso:
+            titulos = generar_titulares(n)
+
+            # Versión anterior: búsqueda de subcadenas tema por tema
+            def por_subcadena():
+                return [[c for c, palabras in temas.items() if any(p in t.lower() for p in palabras)] for t in titulos]
+
+            t_viejo = medir(f"  {n:>6} titulares, subcadenas", por_subcadena, repeticiones=1)
+            t_nuevo = medir(f"  {n:>6} titulares, regex compilada en lote", lambda: clasificador.clasificar_lote(titulos), repeticiones=1)
+            print(f"  {'':>6} {n / (t_viejo / 1000):,.0f} -> {n / (t_nuevo / 1000):,.0f} titulares/s")
+
+
+def bench_moviles(tamanios=(3, 10, 30), dias=2520):
+    titulo(f"Estadísticas móviles ({dias} ruedas, ventanas {list(VENTANAS_MOVILES.values())})")
+    precios = generar_precios(max(tamanios), dias=dias + 1)
+    ancho = precios.pivot(index="Fecha", columns="Ticker", values="Close")
+    for n in tamanios:
+        cierres = ancho.iloc[:, :n]
+        historia = cierres.iloc[:-1]
+
+        # Con rolling de pandas, para cada ventana y cada par de activos
+        def con_rolling():
+            retornos = cierres.pct_change(fill_method=None)
+            for ventana in VENTANAS_MOVILES.values():
+                cierres.rolling(ventana).mean()
+                retornos.rolling(ventana).std()
+                cierres.ewm(span=ventana, adjust=False).mean()
+                for i, a in enumerate(cierres.columns):
+                    for b in cierres.columns[i + 1:]:
+                        retornos[a].rolling(ventana).corr(retornos[b])
+
+        medir(f"  {n:>3} activos, rolling de pandas", con_rolling, repeticiones=1 if n > 10 else 3)
+        medir(f"  {n:>3} activos, sumas acumuladas", lambda: EstadisticasMoviles().actualizar(cierres), repeticiones=3)
+        # actualizar() reemplaza los resultados sin modificarlos: cada copia parte del mismo estado
+        base = EstadisticasMoviles().actualizar(historia)
+        medir(f"  {n:>3} activos, una barra nueva", lambda: copy.copy(base).actualizar(cierres), repeticiones=5)
+
+
+def bench_riesgo(tamanios=(10, 100, 500), dias=1260):
+    titulo(f"Métricas de riesgo ({dias} ruedas)")
+    precios = generar_precios(max(tamanios) + 1, dias=dias)
+    cierres = precios.pivot(index="Fecha", columns="Ticker", values="Close")
+    benchmark = cierres.iloc[:, -1]
+    for n in tamanios:
+        subconjunto = cierres.iloc[:, :n]
+        pesos = pd.Series(1.0, index=subconjunto.columns)
+        medir(f"  {n:>4} posiciones", lambda: metricas_riesgo(subconjunto, pesos, benchmark), repeticiones=3)
+
+
+def bench_proyeccion(caminos=100_000, dias=252, activos=10):
+    titulo(f"Proyección Monte Carlo ({caminos:,} caminos x {dias} ruedas, {activos} activos)")
+    cierres = generar_precios(activos).pivot(index="Fecha", columns="Ticker", values="Close")
+    retornos = matriz_retornos(cierres)
+    for metodo in ("bootstrap", "gbm", "gbm_activos"):
+        medir(f"  {metodo}", lambda: proyectar(retornos, 100_000, dias=dias, caminos=caminos, metodo=metodo, semilla=0),
+              repeticiones=3)
+    medir("  bootstrap, 4 procesos", lambda: proyectar(retornos, 100_000, dias=dias, caminos=caminos, semilla=0, procesos=4),
+          repeticiones=3)
+
+
+def tiempos_importacion(modulo):
+    """Tiempo de pared de importar `modulo` en un proceso nuevo y los paquetes
+    de primer nivel más pesados según `python -X importtime` (en ms)."""
+    inicio = time.perf_counter()
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                             capture_output=True, text=True)
+    total = (time.perf_counter() - inicio) * 1000
+    if proceso.returncode != 0:
+        raise ImportError(proceso.stderr.strip().splitlines()[-1])
+    paquetes = {}
+    for linea in proceso.stderr.splitlines():
+        partes = linea.split("|")
+        if not linea.startswith("import time:") or len(partes) != 3 or not partes[1].strip().isdigit():
+            continue
+        nombre = partes[2][1:]
+        if not nombre.startswith(" "):
+            paquetes[nombre] = int(partes[1]) / 1000
+    return total, paquetes
+
+
+def bench_importacion():
+    titulo("Arranque en frío: importación por sección (proceso nuevo)")
+    base, _ = tiempos_importacion("sys")
+    print(f"  {'intérprete vacío':<43} {base:>10.2f} ms")
+    modulos = {"informe (menú sin sección)": "instrumentacion, streamlit"}
+    modulos.update({nombre: f"secciones.{nombre}" for nombre in
+                    ["dolar", "titulares", "precios", "evolucion", "portafolio", "analisis"]})
+    for nombre, modulo in modulos.items():
+        try:
+            total, paquetes = tiempos_importacion(modulo)
+        except ImportError as e:
+            print(f"  {nombre}: no se pudo importar ({e})")
+            continue
+        RESULTADOS[f"{_grupo}: {nombre}"] = total - base
+        pesados = sorted(paquetes.items(), key=lambda x: x[1], reverse=True)[:4]
+        print(f"  {nombre:<43} {total - base:>10.2f} ms  "
+              + ", ".join(f"{p.strip()} {ms:.0f}" for p, ms in pesados))
+
+
+BENCHMARKS = {
+    "evolucion": bench_evolucion,
+    "alineacion": bench_alineacion,
+    "cache_precios": bench_cache_precios,
+    "cotizaciones": bench_cotizaciones,
+    "tablero": bench_tablero,
+    "servicio_datos": bench_servicio_datos,
+    "valuacion": bench_valuacion,
+    "carteras": bench_carteras,
+    "serie_cartera": bench_serie_cartera,
+    "conversion": bench_conversion,
+    "dolar": bench_dolar,
+    "dolar_sintetico": bench_dolar_sintetico,
+    "ingesta_dolar": bench_ingesta_dolar,
+    "graficos": bench_graficos,
+    "universo": bench_universo,
+    "titulares": bench_titulares,
+    "moviles": bench_moviles,
+    "riesgo": bench_riesgo,
+    "proyeccion": bench_proyeccion,
+    "importacion": bench_importacion,
+}
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "sin-git"
+
+
+def guardar_resultados(directorio=DIRECTORIO_RESULTADOS):
+    """Escribe RESULTADOS en <directorio>/<fecha>_<commit>.json y devuelve la ruta."""
+    os.makedirs(directorio, exist_ok=True)
+    ahora = datetime.now()
+    commit = _commit()
+    ruta = os.path.join(directorio, f"{ahora:%Y%m%d-%H%M%S}_{commit}.json")
+    with open(ruta, "w") as f:
+        json.dump({"commit": commit, "fecha": ahora.isoformat(), "resultados": RESULTADOS}, f, indent=1, ensure_ascii=False)
+    return ruta
+
+
+def comparar_resultados(directorio=DIRECTORIO_RESULTADOS, excluir=None, umbral=UMBRAL_REGRESION):
+    """Compara RESULTADOS con la última corrida guardada; marca lo que empeoró más de `umbral`."""
+    anteriores = sorted(f for f in os.listdir(directorio) if f.endswith(".json")) if os.path.isdir(directorio) else []
+    anteriores = [f for f in anteriores if os.path.join(directorio, f) != excluir]
+    if not anteriores:
+        print("No hay resultados anteriores para comparar.")
+        return []
+    with open(os.path.join(directorio, anteriores[-1])) as f:
+        anterior = json.load(f)
+    print(f"Comparación con {anterior['commit']} ({anterior['fecha'][:16]})")
+    regresiones = []
+    for nombre, ms in RESULTADOS.items():
+        previo = anterior["resultados"].get(nombre)
+        if not previo:
+            continue
+        cambio = ms / previo - 1
+        marca = "  <-- regresión" if cambio > umbral else ""
+        print(f"  {nombre[:70]:<70} {previo:>10.2f} -> {ms:>10.2f} ms ({cambio:+.0%}){marca}")
+        if marca:
+            regresiones.append(nombre)
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks offline del Informe Económico Semanal.")
+    parser.add_argument("grupos", nargs="*", help=f"grupos a correr, entre: {', '.join(BENCHMARKS)} (por defecto, todos)")
+    parser.add_argument("--guardar", action="store_true", help=f"guardar los resultados en {DIRECTORIO_RESULTADOS}/")
+    parser.add_argument("--comparar", action="store_true", help="comparar con la última corrida guardada")
+    args = parser.parse_args(argv)
+    desconocidos = set(args.grupos) - set(BENCHMARKS)
+    if desconocidos:
+        parser.error(f"grupos desconocidos: {', '.join(sorted(desconocidos))}")
+
+    for grupo in args.grupos or BENCHMARKS:
+        BENCHMARKS[grupo]()
+    ruta = guardar_resultados() if args.guardar else None
+    regresiones = comparar_resultados(excluir=ruta) if args.comparar else []
+    if ruta:
+        print(f"Resultados guardados en {ruta}")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
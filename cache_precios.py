@@ -0,0 +1,228 @@
+import json
+import math
+import os
+import re
+import threading
+from collections import defaultdict
+
+import pandas as pd
+
+import instrumentacion
+from datos import _recortar_periodo
+
+DIRECTORIO_CACHE = ".cache_precios"
+
+
+class CachePrecios:
+    """Históricos OHLC guardados en disco, un archivo Parquet por ticker e intervalo.
+
+    Envuelve a un proveedor (ProveedorYahoo o ProveedorLocal) y sólo le pide las
+    barras que faltan: la cola desde la última fecha guardada, o el tramo inicial
+    si se pide un periodo más largo que el que ya se tiene.
+    """
+
+    def __init__(self, proveedor, directorio=DIRECTORIO_CACHE, intervalo="1d", ttl=pd.Timedelta(minutes=15)):
+        self.proveedor = proveedor
+        self.directorio = directorio
+        self.intervalo = intervalo
+        self.ttl = ttl
+        self.descargas = 0
+        self._memoria = {}
+        self._sin_datos = {}
+        self._lock = threading.Lock()
+        os.makedirs(directorio, exist_ok=True)
+        self._ruta_indice = os.path.join(directorio, "indice.json")
+        try:
+            with open(self._ruta_indice) as f:
+                self.indice = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.indice = {}
+
+    def _clave(self, ticker):
+        return f"{ticker}|{self.intervalo}"
+
+    def _ruta(self, ticker):
+        nombre = re.sub(r"[^\w.-]", "_", ticker)
+        return os.path.join(self.directorio, f"{nombre}_{self.intervalo}.parquet")
+
+    def _meta(self, ticker):
+        # El índice y la memoria se comparten entre sesiones e hilos: siempre bajo el lock
+        with self._lock:
+            return self.indice.get(self._clave(ticker))
+
+    def _leer(self, ticker):
+        with self._lock:
+            if self._clave(ticker) not in self.indice:
+                return None
+            if ticker in self._memoria:
+                return self._memoria[ticker]
+        try:
+            barras = pd.read_parquet(self._ruta(ticker))
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+        with self._lock:
+            # Si otro hilo guardó barras más nuevas mientras se leía el archivo, ganan ésas
+            return self._memoria.setdefault(ticker, barras)
+
+    def _guardar(self, ticker, barras, desde):
+        # Escritura atómica: otra sesión puede estar leyendo el mismo archivo
+        ruta = self._ruta(ticker)
+        temporal = f"{ruta}.{threading.get_ident()}.tmp"
+        barras.to_parquet(temporal)
+        os.replace(temporal, ruta)
+        with self._lock:
+            self._memoria[ticker] = barras
+            self.indice[self._clave(ticker)] = {
+                "desde": None if desde is None else str(pd.Timestamp(desde).date()),
+                "hasta": str(barras.index.max().date()),
+                "actualizado": pd.Timestamp.now().isoformat(),
+            }
+
+    def _guardar_indice(self):
+        with self._lock:
+            temporal = f"{self._ruta_indice}.{threading.get_ident()}.tmp"
+            with open(temporal, "w") as f:
+                json.dump(self.indice, f, indent=1, sort_keys=True)
+            os.replace(temporal, self._ruta_indice)
+
+    def _cubre(self, meta, barras, inicio, periodo):
+        # "desde" None significa que ya se descargó el histórico completo
+        if meta["desde"] is None:
+            return True
+        desde = pd.Timestamp(meta["desde"])
+        if inicio is not None:
+            return desde <= pd.Timestamp(inicio)
+        if periodo == "max":
+            return False
+        return desde <= barras.index.max() - pd.Timedelta(periodo)
+
+    def _combinar(self, ticker, viejas, nuevas, desde):
+        barras = nuevas if viejas is None else pd.concat([viejas, nuevas])
+        barras = barras[~barras.index.duplicated(keep="last")].sort_index()
+        self._guardar(ticker, barras, desde)
+        return barras
+
+    @staticmethod
+    def _ajustada(guardadas, bloque):
+        # La anteúltima barra guardada ya estaba cerrada: si el proveedor ahora da otro
+        # cierre, ajustó el histórico hacia atrás (split o dividendo con auto_adjust)
+        if len(guardadas) < 2 or guardadas.index[-2] not in bloque.index:
+            return False
+        fecha = guardadas.index[-2]
+        return not math.isclose(bloque.at[fecha, "Close"], guardadas.at[fecha, "Close"], rel_tol=1e-4)
+
+    def _asegurar(self, tickers, inicio=None, periodo=None):
+        barras = {}
+        faltantes = []
+        colas = defaultdict(list)
+        ahora = pd.Timestamp.now()
+        # Un rango vacío no dice nada de los demás (p. ej. `inicio` posterior a la última barra)
+        rango = (None if inicio is None else pd.Timestamp(inicio), periodo)
+
+        for ticker in dict.fromkeys(tickers):
+            with self._lock:
+                sin_datos = self._sin_datos.get((ticker, *rango))
+            if sin_datos is not None and ahora - sin_datos < self.ttl:
+                continue
+            meta = self._meta(ticker)
+            guardadas = self._leer(ticker)
+            if guardadas is None or guardadas.empty or not self._cubre(meta, guardadas, inicio, periodo):
+                faltantes.append(ticker)
+                instrumentacion.cache("cache_precios", "fallo")
+                if guardadas is not None and not guardadas.empty:
+                    barras[ticker] = guardadas
+                continue
+            barras[ticker] = guardadas
+            if ahora - pd.Timestamp(meta["actualizado"]) > self.ttl:
+                # Se vuelve a pedir la última barra porque puede estar incompleta, y la
+                # anterior para comparar con lo guardado
+                colas[guardadas.index[-2] if len(guardadas) > 1 else guardadas.index[-1]].append(ticker)
+                instrumentacion.cache("cache_precios", "cola")
+            else:
+                instrumentacion.cache("cache_precios", "acierto")
+
+        if faltantes:
+            with self._lock:
+                self.descargas += 1
+            nuevas = self.proveedor.ohlc(faltantes, inicio=inicio, periodo=periodo)
+            for ticker in faltantes:
+                if ticker not in nuevas and ticker not in barras:
+                    # Ticker sin datos en este rango: no se vuelve a pedir hasta que venza el TTL
+                    with self._lock:
+                        self._sin_datos[(ticker, *rango)] = ahora
+            for ticker, bloque in nuevas.items():
+                if periodo == "max":
+                    desde = None
+                elif inicio is not None:
+                    desde = pd.Timestamp(inicio)
+                else:
+                    desde = bloque.index.max() - pd.Timedelta(periodo)
+                meta = self._meta(ticker)
+                if meta and barras.get(ticker) is not None and desde is not None:
+                    desde = None if meta["desde"] is None else min(desde, pd.Timestamp(meta["desde"]))
+                barras[ticker] = self._combinar(ticker, barras.get(ticker), bloque, desde)
+
+        ajustados = defaultdict(list)
+        for desde_cola, grupo in colas.items():
+            with self._lock:
+                self.descargas += 1
+            nuevas = self.proveedor.ohlc(grupo, inicio=desde_cola)
+            for ticker in grupo:
+                meta = self._meta(ticker)
+                bloque = nuevas.get(ticker)
+                if bloque is None or bloque.empty:
+                    # Sin barras nuevas: sólo se renueva la marca de actualización
+                    self._guardar(ticker, barras[ticker], meta["desde"])
+                elif self._ajustada(barras[ticker], bloque):
+                    ajustados[meta["desde"]].append(ticker)
+                    instrumentacion.cache("cache_precios", "ajuste")
+                else:
+                    barras[ticker] = self._combinar(ticker, barras[ticker], bloque, meta["desde"])
+
+        # Histórico guardado en otra base de ajuste: se descarta y se vuelve a pedir el mismo rango
+        for desde, grupo in ajustados.items():
+            with self._lock:
+                self.descargas += 1
+            nuevas = self.proveedor.ohlc(grupo, inicio=desde, periodo="max" if desde is None else None)
+            for ticker in grupo:
+                bloque = nuevas.get(ticker)
+                if bloque is not None and not bloque.empty:
+                    barras[ticker] = self._combinar(ticker, None, bloque, desde)
+
+        if faltantes or colas:
+            self._guardar_indice()
+        return barras
+
+    def historial(self, ticker, inicio=None):
+        barras = self._asegurar([ticker], inicio=inicio, periodo=None if inicio is not None else "max").get(ticker)
+        if barras is None:
+            return pd.DataFrame(columns=["Close"])
+        if inicio is not None:
+            barras = barras[barras.index >= pd.Timestamp(inicio)]
+        return barras
+
+    def cierres(self, tickers, inicio):
+        """Cierres en formato ancho (fecha x ticker) desde `inicio`.
+
+        A diferencia de llamar a historial() por ticker, los que faltan se
+        piden al proveedor en una sola descarga.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        barras = self._asegurar(tickers, inicio=inicio)
+        cierres = {ticker: barras[ticker]["Close"] for ticker in tickers if ticker in barras}
+        if not cierres:
+            return pd.DataFrame()
+        df = pd.concat(cierres, axis=1).sort_index()
+        df.index.name = "Fecha"
+        return df[df.index >= pd.Timestamp(inicio)]
+
+    def historiales(self, tickers, periodo, recortar=True):
+        # Con recortar=False devuelve todo lo guardado, que cubre al menos `periodo`
+        tickers = list(dict.fromkeys(tickers))
+        barras = self._asegurar(tickers, periodo=periodo)
+        cierres = {ticker: barras[ticker]["Close"] for ticker in tickers if ticker in barras}
+        if not cierres:
+            return pd.DataFrame()
+        df = pd.concat(cierres, axis=1).reindex(columns=tickers).sort_index()
+        df.index.name = "Fecha"
+        return _recortar_periodo(df, periodo) if recortar else df
@@ -0,0 +1,198 @@
+"""Prueba de carga de la app sin internet ni servidor de Streamlit.
+
+    python carga.py --sesiones 20 --reruns 10 --latencia 0.1 --errores 0.02
+
+Simula N sesiones simultáneas que recorren las seis secciones del informe
+en orden aleatorio. Cada rerun hace el mismo trabajo de datos que la
+sección en informe.py (sin dibujar los widgets ni las caches de
+st.cache_data) sobre una sola pila compartida: ProveedorLocal con latencia
+y errores configurables, ServicioDatos, CachePrecios, MotorCotizaciones y el
+almacén del dólar (AlmacenDolar).
+Al final informa la latencia p50/p95/p99 de cada sección y cuántos
+pedidos llegaron al proveedor.
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cache_precios import CachePrecios
+from cotizaciones import MotorCotizaciones
+from datos import ACTIVOS_EVOLUCION, ProveedorLocal, _recortar_periodo, alinear_cierres
+from dolar import MONEDAS, VENTANAS
+from graficos import reducir, reducir_series
+from ingesta_dolar import AlmacenDolar
+from instrumentacion import ACUMULADO, etapa, iniciar_registro
+from moviles import EstadisticasMoviles
+from riesgo import BENCHMARK, metricas_riesgo
+from servicio_datos import ServicioDatos
+from titulares import FUENTES, AlmacenTitulares
+from universo import UniversoActivos
+from valuacion import alertas_cartera, cartera_a_lotes, cierres_cartera, valuar_cartera, valuar_lotes
+
+SECCIONES = [
+    "Valuación de portafolio",
+    "Evolución de activos",
+    "Cotización del dólar",
+    "Titulares económicos",
+    "Precios actuales de activos",
+    "Análisis automático",
+]
+
+
+class Entorno:
+    """Recursos compartidos por todas las sesiones, como los st.cache_resource de la app."""
+
+    def __init__(self, proveedor, directorio):
+        self.proveedor = proveedor
+        self.servicio = ServicioDatos(proveedor)
+        self.cache = CachePrecios(self.servicio, directorio=directorio)
+        self.motor = MotorCotizaciones(self.servicio)
+        self.almacen = AlmacenTitulares(FUENTES, directorio=None, proveedor=self.servicio)
+        # Como cargar_dolar: el almacén de segmentos, armado en el directorio temporal
+        self.dolar = AlmacenDolar.desde_csv("valores_limpio.csv", os.path.join(directorio, "almacen_dolar"))
+        self.moviles_dolar = EstadisticasMoviles(sin_retornos=["Brecha"])
+        self.moviles = {}
+        self.universo = UniversoActivos.desde_csv("assets_yahoo_top100.csv")
+        self.tickers = self.universo.tickers.tolist()
+
+
+class Sesion:
+    """Estado de una sesión de usuario (lo que la app guarda en st.session_state)."""
+
+    def __init__(self, entorno, semilla):
+        self.entorno = entorno
+        self.rng = random.Random(semilla)
+        self.favoritos = entorno.universo.buscar("", limite=10)
+        self.cartera = [
+            {"Ticker": ticker, "Fecha": "2023-01-01", "Cantidad": self.rng.randint(1, 10)}
+            for ticker in self.rng.sample(entorno.tickers, 5)
+        ]
+
+    def portafolio(self):
+        valuados, historico = valuar_cartera(self.cartera, self.entorno.cache)
+        if not historico.empty:
+            reducir(historico.reset_index(), "Fecha", "Total")
+
+    def evolucion(self):
+        nombres = self.rng.sample(list(ACTIVOS_EVOLUCION), 3)
+        periodo = self.rng.choice(["7d", "30d", "90d", "180d", "365d", "max"])
+        tickers = tuple(ACTIVOS_EVOLUCION[n] for n in nombres)
+        completos = self.entorno.cache.historiales(tickers, periodo, recortar=False).dropna(axis=1, how="all")
+        cierres = _recortar_periodo(completos, periodo).dropna(axis=1, how="all")
+        if not cierres.empty:
+            precios, _, _ = alinear_cierres(cierres)
+            # Como obtener_moviles: una por conjunto de activos, sobre el histórico completo
+            self.entorno.moviles.setdefault(tickers, EstadisticasMoviles()).actualizar(completos.ffill())
+            reducir_series(precios.reset_index(), "Fecha", list(precios.columns))
+
+    def dolar(self):
+        serie = self.entorno.dolar.serie()
+        self.entorno.moviles_dolar.actualizar(serie.df.set_index("fecha")[MONEDAS + ["Brecha"]])
+        fecha = serie.fecha_min + (serie.fecha_max - serie.fecha_min) * self.rng.random()
+        serie.cotizacion(fecha)
+        ventana = serie.ventana(self.rng.choice(list(VENTANAS)))
+        reducir_series(ventana, "fecha", MONEDAS)
+        reducir(ventana, "fecha", "Brecha")
+
+    def titulares(self):
+        self.entorno.almacen.actualizar_si_corresponde()
+        self.entorno.almacen.recientes(list(FUENTES), cantidad=20)
+
+    def precios_actuales(self):
+        self.entorno.motor.instantanea(self.favoritos)
+
+    def analisis(self):
+        lotes = cartera_a_lotes(self.cartera)
+        cierres = cierres_cartera(lotes, self.entorno.cache)
+        valuados = valuar_lotes(lotes, cierres)
+        if valuados.empty:
+            return
+        alertas_cartera(valuados)
+        benchmark = self.entorno.cache.historial(BENCHMARK, inicio=lotes["Fecha"].min())["Close"]
+        metricas_riesgo(cierres, valuados.groupby("Ticker")["Valuación actual"].sum(), benchmark)
+
+    def rerun(self, seccion):
+        return {
+            "Valuación de portafolio": self.portafolio,
+            "Evolución de activos": self.evolucion,
+            "Cotización del dólar": self.dolar,
+            "Titulares económicos": self.titulares,
+            "Precios actuales de activos": self.precios_actuales,
+            "Análisis automático": self.analisis,
+        }[seccion]()
+
+
+def ejecutar(entorno, sesiones=20, reruns=10, semilla=0):
+    """Corre las sesiones en paralelo y devuelve una fila por rerun (sección, ms, error)."""
+    mediciones = []
+    lock = threading.Lock()
+
+    def recorrer(i):
+        sesion = Sesion(entorno, semilla + i)
+        for _ in range(reruns):
+            seccion = sesion.rng.choice(SECCIONES)
+            iniciar_registro()
+            inicio = time.perf_counter()
+            error = None
+            try:
+                with etapa(seccion):
+                    sesion.rerun(seccion)
+            except Exception as e:
+                error = type(e).__name__
+            with lock:
+                mediciones.append((seccion, (time.perf_counter() - inicio) * 1000, error))
+
+    with ThreadPoolExecutor(max_workers=sesiones) as pool:
+        list(pool.map(recorrer, range(sesiones)))
+    return pd.DataFrame(mediciones, columns=["Sección", "ms", "error"])
+
+
+def resumir(mediciones):
+    """Reruns, errores y latencia p50/p95/p99 (ms) por sección y en total."""
+    def fila(df):
+        p50, p95, p99 = np.percentile(df["ms"], [50, 95, 99]) if len(df) else (np.nan,) * 3
+        return pd.Series({"reruns": len(df), "errores": int(df["error"].notna().sum()), "p50": p50, "p95": p95, "p99": p99})
+
+    tabla = pd.DataFrame({seccion: fila(df) for seccion, df in mediciones.groupby("Sección")}).T
+    tabla.loc["Total"] = fila(mediciones)
+    return tabla
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga offline de las secciones del informe.")
+    parser.add_argument("--sesiones", type=int, default=20, help="sesiones simultáneas")
+    parser.add_argument("--reruns", type=int, default=10, help="reruns por sesión")
+    parser.add_argument("--latencia", type=float, default=0.05, help="segundos de demora por pedido al proveedor")
+    parser.add_argument("--errores", type=float, default=0.0, help="probabilidad de que un pedido falle")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--metricas", help="archivo donde guardar las métricas acumuladas en formato OpenMetrics")
+    args = parser.parse_args(argv)
+
+    proveedor = ProveedorLocal.desde_csv(latencia=args.latencia, errores=args.errores, sinteticos=True, semilla=args.semilla)
+    with tempfile.TemporaryDirectory() as directorio:
+        entorno = Entorno(proveedor, directorio)
+        inicio = time.perf_counter()
+        mediciones = ejecutar(entorno, args.sesiones, args.reruns, args.semilla)
+        duracion = time.perf_counter() - inicio
+
+    print(f"{args.sesiones} sesiones x {args.reruns} reruns en {duracion:.1f} s "
+          f"(latencia {args.latencia * 1000:.0f} ms, errores {args.errores:.0%})")
+    print(resumir(mediciones).to_string(float_format=lambda x: f"{x:,.1f}"))
+    estadisticas = entorno.servicio.estadisticas()
+    print(f"Pedidos al proveedor: {proveedor.pedidos} "
+          f"({estadisticas['aciertos']} aciertos, {estadisticas['coalescidos']} agrupados, "
+          f"{estadisticas['errores']} errores en el servicio de datos)")
+    if args.metricas:
+        with open(args.metricas, "w") as f:
+            f.write(ACUMULADO.openmetrics())
+
+
+if __name__ == "__main__":
+    main()
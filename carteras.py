@@ -0,0 +1,110 @@
+"""Valúa en lote todas las carteras de un directorio.
+
+    python carteras.py carteras/ --salida valuacion_carteras --procesos 4
+
+Cada archivo .csv del directorio tiene el formato de cartera.csv (Ticker,
+Fecha, Cantidad) y su nombre identifica a la cartera. Los tickers de todas
+las carteras se unen y se descargan una sola vez; después las carteras se
+reparten en bloques entre un pool de procesos y cada bloque se valúa con
+operaciones vectorizadas. Se escriben la tabla consolidada (resumen.csv),
+los lotes valuados (lotes.csv) y las alertas de cada cartera (alertas.csv).
+"""
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cache_precios import CachePrecios
+from datos import proveedor_por_defecto
+from valuacion import alertas_carteras, cartera_a_lotes, resumen_carteras, valuar_lotes
+
+
+def leer_carteras(directorio):
+    """Une todos los CSV del directorio en una tabla de lotes con la columna Cartera."""
+    partes = []
+    for ruta in sorted(glob.glob(os.path.join(directorio, "*.csv"))):
+        try:
+            df = pd.read_csv(ruta, usecols=["Ticker", "Fecha", "Cantidad"])
+        except (ValueError, pd.errors.ParserError) as e:
+            print(f"Se omite {ruta}: {e}")
+            continue
+        lotes = cartera_a_lotes(df.to_dict(orient="records"))
+        lotes.insert(0, "Cartera", os.path.splitext(os.path.basename(ruta))[0])
+        partes.append(lotes)
+    if not partes:
+        return pd.DataFrame(columns=["Cartera", "Ticker", "Fecha", "Cantidad"])
+    return pd.concat(partes, ignore_index=True)
+
+
+def _valuar_bloque(lotes, cierres):
+    # Corre en un proceso del pool: sólo recibe los cierres de los tickers del bloque
+    valuados = valuar_lotes(lotes, cierres)
+    return valuados, resumen_carteras(valuados)
+
+
+def valuar_carteras(lotes, cierres, procesos=None, bloques=None):
+    """Valúa todas las carteras de `lotes` (con columna Cartera) contra los mismos `cierres`.
+
+    Devuelve (lotes valuados, resumen por cartera, alertas). Con `procesos`
+    > 1 las carteras se reparten en `bloques` (por defecto, cuatro por
+    proceso) que se valúan en paralelo.
+    """
+    nombres = lotes["Cartera"].unique()
+    procesos = min(procesos or 1, os.cpu_count() or 1)
+    if procesos > 1 and len(nombres) > 1:
+        grupos = np.array_split(nombres, min(len(nombres), bloques or procesos * 4))
+        tareas = []
+        for grupo in grupos:
+            parte = lotes[lotes["Cartera"].isin(grupo)]
+            tareas.append((parte, cierres[cierres.columns.intersection(parte["Ticker"].unique())]))
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            resultados = list(pool.map(_valuar_bloque, *zip(*tareas)))
+    else:
+        resultados = [_valuar_bloque(lotes, cierres)]
+
+    valuados = pd.concat([v for v, _ in resultados]).sort_index()
+    resumen = pd.concat([r for _, r in resultados]).reindex(nombres)
+    return valuados, resumen, alertas_carteras(valuados, resumen.dropna(how="all"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Valúa en lote un directorio de carteras (Ticker, Fecha, Cantidad).")
+    parser.add_argument("directorio", help="directorio con un CSV por cartera")
+    parser.add_argument("--salida", default="valuacion_carteras", help="directorio donde se escriben los resultados")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count(), help="procesos para valuar (1 = sin pool)")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    lotes = leer_carteras(args.directorio)
+    if lotes.empty:
+        parser.error(f"no hay carteras válidas en {args.directorio}")
+    tickers = lotes["Ticker"].unique()
+    leidas = time.perf_counter()
+
+    # Una sola consulta por ticker para todas las carteras, desde la compra más antigua
+    cierres = CachePrecios(proveedor_por_defecto()).cierres(tickers, lotes["Fecha"].min())
+    descargadas = time.perf_counter()
+
+    valuados, resumen, alertas = valuar_carteras(lotes, cierres, procesos=args.procesos)
+    valuadas = time.perf_counter()
+
+    os.makedirs(args.salida, exist_ok=True)
+    resumen.rename_axis("Cartera").to_csv(os.path.join(args.salida, "resumen.csv"))
+    valuados.to_csv(os.path.join(args.salida, "lotes.csv"))
+    alertas.to_csv(os.path.join(args.salida, "alertas.csv"), index=False)
+
+    cantidad = len(resumen)
+    sin_precios = int(resumen["Valuación actual"].isna().sum())
+    print(f"{cantidad} carteras, {len(lotes)} lotes, {len(tickers)} tickers distintos "
+          f"({cantidad - sin_precios} valuadas, {len(alertas)} alertas)")
+    print(f"  lectura {leidas - inicio:.2f} s, precios {descargadas - leidas:.2f} s, "
+          f"valuación {valuadas - descargadas:.2f} s ({cantidad / (valuadas - descargadas):,.0f} carteras/s)")
+    print(f"  total {cantidad / (valuadas - inicio):,.1f} carteras/s; resultados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import instrumentacion
+
+# Campos de yf.Ticker(...).info que usa la app
+CAMPOS = {"regularMarketPrice": "precio", "previousClose": "cierre", "volume": "volumen"}
+COLUMNAS = list(CAMPOS.values()) + ["error", "latencia_ms", "en_cache"]
+
+
+class MotorCotizaciones:
+    """Instantáneas de cotizaciones consultadas en paralelo y reutilizadas durante `ttl` segundos."""
+
+    def __init__(self, proveedor, max_hilos=8, ttl=60):
+        self.proveedor = proveedor
+        self.ttl = ttl
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix="cotizaciones")
+
+    def _consultar(self, ticker):
+        inicio = time.perf_counter()
+        fila = dict.fromkeys(CAMPOS.values())
+        try:
+            info = self.proveedor.cotizacion(ticker) or {}
+            for clave, campo in CAMPOS.items():
+                fila[campo] = info.get(clave)
+            fila["error"] = None
+        except Exception as e:
+            fila["error"] = f"{type(e).__name__}: {e}"
+        fila["latencia_ms"] = (time.perf_counter() - inicio) * 1000
+        return fila
+
+    def instantanea(self, tickers):
+        """Devuelve un DataFrame indexado por ticker con precio, cierre, volumen,
+        variación (%), latencia de la consulta, si vino de la cache y el error si lo hubo."""
+        tickers = list(dict.fromkeys(tickers))
+        ahora = time.monotonic()
+        filas = {}
+        pendientes = []
+
+        with self._lock:
+            for ticker in tickers:
+                guardada = self._cache.get(ticker)
+                if guardada and ahora - guardada[0] < self.ttl:
+                    filas[ticker] = dict(guardada[1], en_cache=True)
+                else:
+                    pendientes.append(ticker)
+
+        instrumentacion.cache("cotizaciones", "acierto", len(tickers) - len(pendientes))
+        instrumentacion.cache("cotizaciones", "fallo", len(pendientes))
+        # Cada consulta corre con el contexto de quien pidió la instantánea: sus llamadas
+        # al proveedor quedan en el registro de instrumentación de esa sesión
+        futuros = {ticker: self._pool.submit(contextvars.copy_context().run, self._consultar, ticker)
+                   for ticker in pendientes}
+        for ticker, futuro in futuros.items():
+            fila = futuro.result()
+            filas[ticker] = dict(fila, en_cache=False)
+            # Los errores no se guardan: se reintentan en la próxima consulta
+            if fila["error"] is None:
+                with self._lock:
+                    self._cache[ticker] = (ahora, fila)
+
+        df = pd.DataFrame.from_dict(filas, orient="index", columns=COLUMNAS).reindex(tickers)
+        df.index.name = "Ticker"
+        for campo in ["precio", "cierre", "volumen"]:
+            df[campo] = pd.to_numeric(df[campo], errors="coerce")
+        df["variacion"] = (df["precio"] - df["cierre"]) / df["cierre"] * 100
+        return df
+
+
+def cambios(anterior, actual, campos=("precio", "cierre", "error")):
+    """Tickers de `actual` cuyo precio, cierre o error difiere de la instantánea `anterior`
+    (o que no estaban en ella), comparando todas las filas de una vez."""
+    if anterior is None:
+        return actual.index
+    if actual.index.equals(anterior.index):
+        iguales = np.ones(len(actual), dtype=bool)
+    else:
+        iguales = actual.index.isin(anterior.index)
+        anterior = anterior.reindex(actual.index)
+    for campo in campos:
+        previo, nuevo = anterior[campo].to_numpy(), actual[campo].to_numpy()
+        iguales &= (previo == nuevo) | (pd.isna(previo) & pd.isna(nuevo))
+    return actual.index[~iguales]
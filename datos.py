@@ -0,0 +1,267 @@
+import os
+import random
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+# Activos disponibles en la sección "Evolución de activos"
+ACTIVOS_EVOLUCION = {
+    "Bitcoin": "BTC-USD", "Ethereum": "ETH-USD", "Gold": "GC=F", "Silver": "SI=F",
+    "Microsoft": "MSFT", "Apple": "AAPL", "Nvidia": "NVDA", "Amazon": "AMZN",
+    "Google": "GOOGL", "Meta": "META", "Tesla": "TSLA", "S&P 500": "^GSPC",
+    "JP Morgan": "JPM", "Visa": "V", "Eli Lilly": "LLY", "Tenaris": "TS"
+}
+
+
+def _normalizar_indice(df):
+    # Cripto cotiza en UTC y acciones en hora de NY: se alinea todo por día calendario
+    indice = pd.to_datetime(df.index)
+    if indice.tz is not None:
+        indice = indice.tz_localize(None)
+    df.index = indice.normalize()
+    df.index.name = "Fecha"
+    return df
+
+
+COLUMNAS_OHLC = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def _recortar_periodo(df, periodo):
+    if df.empty or periodo == "max":
+        return df
+    desde = df.index.max() - pd.Timedelta(periodo)
+    return df[df.index > desde]
+
+
+class Proveedor:
+    """Interfaz común de las fuentes de datos de la app.
+
+    Todas las secciones acceden a los datos a través de estos métodos, de
+    modo que la fuente real (Yahoo Finance y feeds RSS) puede reemplazarse
+    por una reproducción local para medir o probar la app sin internet.
+    """
+
+    def historiales(self, tickers, periodo):
+        """Cierres en formato ancho (fecha x ticker) para el `periodo` indicado."""
+        raise NotImplementedError
+
+    def ohlc(self, tickers, inicio=None, periodo=None):
+        """Dict ticker -> DataFrame con COLUMNAS_OHLC, desde `inicio` o para el `periodo`."""
+        raise NotImplementedError
+
+    def cotizacion(self, ticker):
+        """Dict con el formato de yf.Ticker(ticker).info (al menos precio, cierre y volumen)."""
+        raise NotImplementedError
+
+    def feed(self, url, etag=None, modified=None):
+        """Resultado con el formato de feedparser.parse (entries, bozo, status, etag)."""
+        raise NotImplementedError
+
+
+class ProveedorYahoo(Proveedor):
+    """Datos en vivo: históricos desde Yahoo Finance en una sola descarga y feeds RSS con feedparser."""
+
+    def historiales(self, tickers, periodo):
+        import yfinance as yf
+
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return pd.DataFrame()
+        data = yf.download(tickers, period=periodo, auto_adjust=True, progress=False, threads=True)
+        if data is None or data.empty:
+            return pd.DataFrame()
+        if isinstance(data.columns, pd.MultiIndex):
+            cierres = data["Close"]
+        else:
+            cierres = data[["Close"]].rename(columns={"Close": tickers[0]})
+        cierres = cierres.reindex(columns=tickers)
+        return _normalizar_indice(cierres).groupby(level=0).last()
+
+    def ohlc(self, tickers, inicio=None, periodo=None):
+        # Barras OHLC por ticker, desde `inicio` o para el `periodo` indicado
+        import yfinance as yf
+
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+        if inicio is not None:
+            data = yf.download(tickers, start=inicio, group_by="ticker", auto_adjust=True, progress=False, threads=True)
+        else:
+            data = yf.download(tickers, period=periodo or "max", group_by="ticker", auto_adjust=True, progress=False, threads=True)
+        resultado = {}
+        if data is None or data.empty:
+            return resultado
+        for ticker in tickers:
+            if isinstance(data.columns, pd.MultiIndex):
+                if ticker not in data.columns.get_level_values(0):
+                    continue
+                barras = data[ticker]
+            else:
+                barras = data
+            barras = barras.reindex(columns=COLUMNAS_OHLC).dropna(subset=["Close"])
+            if not barras.empty:
+                resultado[ticker] = _normalizar_indice(barras.copy()).groupby(level=0).last()
+        return resultado
+
+    def cotizacion(self, ticker):
+        import yfinance as yf
+
+        return yf.Ticker(ticker).info
+
+    def feed(self, url, etag=None, modified=None):
+        import feedparser
+
+        return feedparser.parse(url, etag=etag, modified=modified)
+
+
+class ErrorSimulado(ConnectionError):
+    """Falla inyectada por ProveedorLocal para probar la app ante errores del proveedor."""
+
+
+class _Entrada(dict):
+    # Entrada de feed con acceso por atributo, como feedparser.FeedParserDict
+    def __getattr__(self, clave):
+        try:
+            return self[clave]
+        except KeyError:
+            raise AttributeError(clave) from None
+
+
+class ProveedorLocal(Proveedor):
+    """Reemplazo offline de ProveedorYahoo a partir de datos guardados en disco.
+
+    `precios` es una tabla larga con columnas Fecha, Ticker y Close y
+    `titulares` una tabla con columnas titulo, fecha y url (como
+    titulares.csv). `latencia` simula la demora de cada pedido y `errores`
+    la probabilidad de que un pedido falle con ErrorSimulado. Con
+    `sinteticos` los tickers que no están en `precios` reciben un camino
+    aleatorio reproducible, así puede usarse todo el universo de activos.
+    """
+
+    def __init__(self, precios, latencia=0.0, errores=0.0, sinteticos=False, titulares=None, semilla=None):
+        ancho = precios.pivot_table(index="Fecha", columns="Ticker", values="Close", aggfunc="last")
+        self.precios = _normalizar_indice(ancho.sort_index())
+        self.latencia = latencia
+        self.errores = errores
+        self.sinteticos = sinteticos
+        self.titulares = titulares
+        self.pedidos = 0
+        self._sinteticas = {}
+        self._rng = random.Random(semilla)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def desde_csv(cls, ruta="rendimientos.csv", activos=ACTIVOS_EVOLUCION, latencia=0.0, errores=0.0,
+                  sinteticos=False, titulares="titulares.csv", semilla=None):
+        # rendimientos.csv viene con columnas Mes, Activo, Precio (nombres, no tickers)
+        df = pd.read_csv(ruta)
+        df = df.rename(columns={"Mes": "Fecha", "Activo": "Ticker", "Precio": "Close"})
+        df["Fecha"] = pd.to_datetime(df["Fecha"])
+        df["Ticker"] = df["Ticker"].map(lambda nombre: activos.get(nombre, nombre))
+        titulares = pd.read_csv(titulares) if titulares and os.path.exists(titulares) else None
+        return cls(df, latencia=latencia, errores=errores, sinteticos=sinteticos, titulares=titulares, semilla=semilla)
+
+    def _pedido(self):
+        with self._lock:
+            self.pedidos += 1
+            falla = self.errores > 0 and self._rng.random() < self.errores
+        if self.latencia:
+            time.sleep(self.latencia)
+        if falla:
+            raise ErrorSimulado("falla simulada del proveedor")
+
+    def _cierres(self, ticker):
+        if ticker in self.precios.columns:
+            return self.precios[ticker].dropna()
+        if not self.sinteticos:
+            return None
+        with self._lock:
+            if ticker not in self._sinteticas:
+                # Tres años de ruedas hasta el último dato guardado, con semilla fija por ticker
+                rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+                fechas = pd.bdate_range(end=self.precios.index.max(), periods=756, name="Fecha")
+                retornos = rng.normal(0.0003, 0.02, size=len(fechas))
+                self._sinteticas[ticker] = pd.Series(100 * np.exp(np.cumsum(retornos)), index=fechas, name=ticker)
+            return self._sinteticas[ticker]
+
+    def historiales(self, tickers, periodo):
+        self._pedido()
+        tickers = list(dict.fromkeys(tickers))
+        cierres = {}
+        for ticker in tickers:
+            serie = self._cierres(ticker)
+            if serie is not None:
+                cierres[ticker] = serie
+        if not cierres:
+            return pd.DataFrame(columns=tickers)
+        df = pd.concat(cierres, axis=1).reindex(columns=tickers).sort_index().dropna(how="all")
+        df.index.name = "Fecha"
+        return _recortar_periodo(df, periodo)
+
+    def ohlc(self, tickers, inicio=None, periodo=None):
+        self._pedido()
+        resultado = {}
+        for ticker in dict.fromkeys(tickers):
+            cierres = self._cierres(ticker)
+            if cierres is None:
+                continue
+            if inicio is not None:
+                cierres = cierres[cierres.index >= pd.Timestamp(inicio)]
+            else:
+                cierres = _recortar_periodo(cierres, periodo or "max")
+            if not cierres.empty:
+                resultado[ticker] = pd.DataFrame({"Close": cierres}).reindex(columns=COLUMNAS_OHLC)
+        return resultado
+
+    def cotizacion(self, ticker):
+        # Mismo formato que yf.Ticker(ticker).info con las dos últimas barras guardadas
+        self._pedido()
+        cierres = self._cierres(ticker)
+        if cierres is None:
+            raise KeyError(f"{ticker} no está en los datos locales")
+        return {
+            "regularMarketPrice": float(cierres.iloc[-1]),
+            "previousClose": float(cierres.iloc[-2]) if len(cierres) > 1 else None,
+            "volume": None,
+        }
+
+    def feed(self, url, etag=None, modified=None):
+        # Siempre devuelve los mismos titulares: con el ETag de la respuesta anterior contesta 304
+        self._pedido()
+        titulares = self.titulares if self.titulares is not None else pd.DataFrame(columns=["titulo", "fecha", "url"])
+        etag_actual = f"local-{len(titulares)}"
+        if etag == etag_actual:
+            return SimpleNamespace(entries=[], bozo=False, status=304, etag=etag_actual)
+        entradas = [
+            _Entrada(title=t.titulo, link=t.url, published=str(t.fecha))
+            for t in titulares.itertuples()
+        ]
+        return SimpleNamespace(entries=entradas, bozo=False, status=200, etag=etag_actual)
+
+
+def proveedor_por_defecto():
+    """INFORME_PROVEEDOR=local permite usar la app sin conexión.
+
+    En modo local, INFORME_LATENCIA (segundos) e INFORME_ERRORES
+    (probabilidad) simulan un proveedor lento o inestable.
+    """
+    if os.environ.get("INFORME_PROVEEDOR") == "local":
+        return ProveedorLocal.desde_csv(
+            latencia=float(os.environ.get("INFORME_LATENCIA", 0)),
+            errores=float(os.environ.get("INFORME_ERRORES", 0)),
+            sinteticos=True,
+        )
+    return ProveedorYahoo()
+
+
+def alinear_cierres(cierres):
+    """Devuelve (precios alineados, último precio, rendimiento %) por columna."""
+    cierres = cierres.sort_index()
+    ultimos = cierres.ffill().iloc[-1]
+    primeros = cierres.bfill().iloc[0]
+    rendimientos = (ultimos / primeros - 1) * 100
+    return cierres.ffill(), ultimos, rendimientos
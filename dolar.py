@@ -0,0 +1,129 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+MONEDAS = ["USD CCL", "USD MEP", "OFICIAL", "EUR", "UYU"]
+VENTANAS = {"7 días": 7, "30 días": 30, "90 días": 90, "180 días": 180, "365 días": 365, "Histórico": None}
+DIRECTORIO_CACHE = ".cache_dolar"
+# Monedas en las que se puede expresar una valuación en dólares: (columna
+# multiplicadora, columna divisora). Los dólares y el euro cotizan en pesos;
+# UYU ya está en pesos uruguayos por dólar. El euro se pasa por el CCL, que
+# es el mercado contra el que cotiza en la serie.
+CONVERSIONES = {
+    "USD": (None, None),
+    "ARS (CCL)": ("USD CCL", None),
+    "ARS (MEP)": ("USD MEP", None),
+    "ARS (Oficial)": ("OFICIAL", None),
+    "EUR": ("USD CCL", "EUR"),
+    "UYU": ("UYU", None),
+}
+
+
+def calcular_brecha(ccl, oficial):
+    return ((ccl.astype(np.float64) / oficial - 1) * 100).astype(np.float32)
+
+
+class SerieDolar:
+    """Cotizaciones diarias ordenadas por fecha, en arrays tipados.
+
+    `fechas` es datetime64[ns] creciente y `valores` una matriz float32 con una
+    columna por moneda. Las ventanas de 7 a 365 días quedan precalculadas como
+    índices de inicio, y la búsqueda por fecha es binaria (searchsorted).
+    """
+
+    def __init__(self, fechas, valores, monedas=MONEDAS, brecha=None):
+        orden = np.argsort(fechas, kind="stable")
+        self.fechas = fechas[orden].astype("datetime64[ns]")
+        self.valores = valores[orden].astype(np.float32)
+        self.monedas = list(monedas)
+        if brecha is None:
+            ccl = self.valores[:, self.monedas.index("USD CCL")]
+            oficial = self.valores[:, self.monedas.index("OFICIAL")]
+            brecha = calcular_brecha(ccl, oficial)
+        else:
+            brecha = np.asarray(brecha, dtype=np.float32)[orden]
+        self.brecha = brecha
+
+        self.df = pd.DataFrame(self.valores, columns=self.monedas)
+        self.df.insert(0, "fecha", self.fechas)
+        self.df["Brecha"] = self.brecha
+
+        ultima = self.fechas[-1] if len(self.fechas) else np.datetime64("NaT")
+        self.inicios = {
+            nombre: 0 if dias is None else int(np.searchsorted(self.fechas, ultima - np.timedelta64(dias, "D"), side="right"))
+            for nombre, dias in VENTANAS.items()
+        }
+
+    @classmethod
+    def desde_csv(cls, ruta="valores_limpio.csv", directorio_cache=DIRECTORIO_CACHE):
+        # Si hay un binario más nuevo que el CSV se evita parsearlo
+        binario = None
+        if directorio_cache:
+            nombre = os.path.splitext(os.path.basename(ruta))[0]
+            binario = os.path.join(directorio_cache, f"{nombre}.npz")
+            if os.path.exists(binario) and os.path.getmtime(binario) >= os.path.getmtime(ruta):
+                with np.load(binario) as datos:
+                    return cls(datos["fechas"], datos["valores"], [str(m) for m in datos["monedas"]])
+
+        df = pd.read_csv(ruta, usecols=["fecha"] + MONEDAS, parse_dates=["fecha"])
+        df = df.sort_values("fecha").ffill()
+        serie = cls(df["fecha"].to_numpy(), df[MONEDAS].to_numpy(dtype=np.float32), MONEDAS)
+        if binario:
+            serie.guardar(binario)
+        return serie
+
+    def extender(self, fechas, valores, brecha):
+        """Nueva serie con las filas agregadas al final; la brecha de las existentes no se recalcula."""
+        return SerieDolar(
+            np.concatenate([self.fechas, np.asarray(fechas, dtype="datetime64[ns]")]),
+            np.concatenate([self.valores, np.asarray(valores, dtype=np.float32)]),
+            self.monedas,
+            np.concatenate([self.brecha, np.asarray(brecha, dtype=np.float32)]),
+        )
+
+    def guardar(self, binario):
+        os.makedirs(os.path.dirname(binario) or ".", exist_ok=True)
+        temporal = f"{binario}.tmp.npz"
+        np.savez(temporal, fechas=self.fechas, valores=self.valores, monedas=np.array(self.monedas))
+        os.replace(temporal, binario)
+
+    @property
+    def fecha_min(self):
+        return pd.Timestamp(self.fechas[0])
+
+    @property
+    def fecha_max(self):
+        return pd.Timestamp(self.fechas[-1])
+
+    def posicion(self, fecha):
+        # Última fila con fecha <= `fecha` (-1 si es anterior al primer dato)
+        return int(np.searchsorted(self.fechas, np.datetime64(pd.Timestamp(fecha), "ns"), side="right")) - 1
+
+    def factores(self, destino, fechas):
+        """Unidades de `destino` por dólar en cada una de `fechas`, con la última
+        cotización anterior o igual a cada fecha (NaN antes del primer dato).
+
+        Es un join as-of de todas las fechas contra la serie en una sola
+        búsqueda binaria vectorizada, sin importar el orden de `fechas`.
+        """
+        multiplicador, divisor = CONVERSIONES[destino]
+        fechas = pd.DatetimeIndex(fechas).tz_localize(None).to_numpy(dtype="datetime64[ns]")
+        if multiplicador is None:
+            return np.ones(len(fechas))
+        posiciones = np.searchsorted(self.fechas, fechas, side="right") - 1
+        filas = self.valores[np.maximum(posiciones, 0)].astype(np.float64)
+        factores = filas[:, self.monedas.index(multiplicador)]
+        if divisor is not None:
+            factores = factores / filas[:, self.monedas.index(divisor)]
+        factores[posiciones < 0] = np.nan
+        return factores
+
+    def cotizacion(self, fecha):
+        i = self.posicion(fecha)
+        if i < 0:
+            return None
+        return dict(zip(self.monedas, self.valores[i].tolist()), Brecha=float(self.brecha[i]))
+
+    def ventana(self, nombre):
+        return self.df.iloc[self.inicios[nombre]:]
@@ -0,0 +1,96 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Puntos máximos por serie que se envían al navegador (0 desactiva la reducción).
+# "minmax" es totalmente vectorizado; "lttb" conserva mejor la forma pero recorre
+# los tramos en Python.
+MAX_PUNTOS = int(os.environ.get("INFORME_MAX_PUNTOS", 1500))
+
+
+def _a_numeros(valores):
+    valores = np.asarray(valores)
+    if np.issubdtype(valores.dtype, np.datetime64):
+        return valores.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    return valores.astype(np.float64)
+
+
+def lttb(x, y, n):
+    """Índices de los `n` puntos elegidos con Largest-Triangle-Three-Buckets.
+
+    Conserva el primer y el último punto y, en cada tramo, el que forma el
+    triángulo de mayor área con el punto anterior elegido y el promedio del
+    tramo siguiente, de modo que picos y caídas sobreviven a la reducción.
+    """
+    largo = len(x)
+    if n >= largo or n < 3:
+        return np.arange(largo)
+    x = _a_numeros(x)
+    y = _a_numeros(y)
+
+    bordes = np.linspace(1, largo - 1, n - 1).astype(np.int64)
+    finales = np.append(bordes[1:], largo)
+    elegidos = np.empty(n, dtype=np.int64)
+    elegidos[0] = 0
+    elegidos[-1] = largo - 1
+
+    # Promedios de cada tramo calculados de una vez con sumas acumuladas
+    suma_x = np.concatenate([[0.0], np.cumsum(x)])
+    suma_y = np.concatenate([[0.0], np.cumsum(y)])
+    promedio_x = (suma_x[finales] - suma_x[bordes]) / (finales - bordes)
+    promedio_y = (suma_y[finales] - suma_y[bordes]) / (finales - bordes)
+
+    a = 0
+    for i in range(n - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        sig_x, sig_y = promedio_x[i + 1], promedio_y[i + 1]
+        area = np.abs((x[a] - sig_x) * (y[inicio:fin] - y[a]) - (x[a] - x[inicio:fin]) * (sig_y - y[a]))
+        a = inicio + int(np.argmax(area))
+        elegidos[i + 1] = a
+    return elegidos
+
+
+def min_max(y, n):
+    """Índices del mínimo y el máximo de cada uno de n/2 tramos, sin loops de Python."""
+    largo = len(y)
+    if n >= largo or n < 4:
+        return np.arange(largo)
+    tramos = n // 2
+    tramo = (np.arange(largo) * tramos) // largo
+    orden = np.lexsort((_a_numeros(y), tramo))
+    cortes = np.searchsorted(tramo[orden], np.arange(tramos))
+    minimos = orden[cortes]
+    maximos = orden[np.append(cortes[1:], largo) - 1]
+    return np.unique(np.concatenate([[0, largo - 1], minimos, maximos]))
+
+
+METODOS = {"lttb": lttb, "minmax": lambda x, y, n: min_max(y, n)}
+
+
+def reducir(df, x, y, max_puntos=None, metodo="minmax"):
+    """Filas de `df` a graficar para una sola serie `y`."""
+    max_puntos = MAX_PUNTOS if max_puntos is None else max_puntos
+    df = df.dropna(subset=[y])
+    if not max_puntos or len(df) <= max_puntos:
+        return df
+    return df.iloc[METODOS[metodo](df[x].to_numpy(), df[y].to_numpy(), max_puntos)]
+
+
+def reducir_series(df, x, columnas, max_puntos=None, var_name="variable", value_name="value", metodo="minmax"):
+    """Versión larga (como DataFrame.melt) con cada serie reducida por separado.
+
+    Se usa en lugar de melt antes de px.line: cada traza conserva su forma
+    sin multiplicar los puntos por la cantidad de series.
+    """
+    partes = []
+    for columna in columnas:
+        serie = reducir(df[[x, columna]], x, columna, max_puntos, metodo)
+        partes.append(pd.DataFrame({
+            x: serie[x].to_numpy(),
+            var_name: columna,
+            value_name: serie[columna].to_numpy(),
+        }))
+    if not partes:
+        return pd.DataFrame(columns=[x, var_name, value_name])
+    return pd.concat(partes, ignore_index=True)
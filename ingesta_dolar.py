@@ -0,0 +1,286 @@
+"""Agrega cotizaciones nuevas a la serie del dólar sin reprocesar el histórico.
+
+    python ingesta_dolar.py nuevas.csv                          # al almacén de la app
+    python ingesta_dolar.py nuevas.csv --csv valores_limpio.csv # y también al CSV
+
+El archivo de entrada tiene las columnas de valores_limpio.csv (fecha y
+las monedas; Brecha se ignora y se recalcula). Sólo se validan y limpian
+las filas nuevas: se descartan fechas inválidas, repetidas o anteriores a
+la última guardada y valores no positivos, se completan los huecos con el
+último estado guardado y se calcula la brecha de esas filas. Cada ingesta
+se escribe como un segmento Parquet más, así que el costo depende de las
+filas agregadas y no del largo de la serie; la app lee sólo los segmentos
+que todavía no tiene.
+
+El almacén recuerda la fecha de modificación y el tamaño del CSV con el que
+se armó: si el CSV se edita, se vuelve a armar con él (conservando las
+filas ingeridas posteriores a su última fecha).
+"""
+import argparse
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dolar import DIRECTORIO_CACHE, MONEDAS, SerieDolar, calcular_brecha
+
+DIRECTORIO_ALMACEN = os.path.join(DIRECTORIO_CACHE, "almacen")
+# Con más segmentos que esto se reescriben en uno solo
+MAX_SEGMENTOS = 64
+
+
+class AlmacenDolar:
+    """Serie del dólar en segmentos Parquet que sólo crecen al final.
+
+    `indice.json` lista los segmentos en orden (archivo, primera y última
+    fecha, filas) y guarda la última fila ya completada, que es todo lo que
+    hace falta para limpiar una ingesta nueva sin leer las anteriores.
+
+    Con `origen` (un CSV como valores_limpio.csv) el índice también guarda
+    la firma del CSV (mtime y tamaño); cuando cambia, `sincronizar` vuelve a
+    armar los segmentos y sube la `version`, así `serie()` no sigue
+    extendiendo una serie vieja.
+    """
+
+    def __init__(self, directorio=DIRECTORIO_ALMACEN, origen=None):
+        self.directorio = directorio
+        self.origen = origen
+        self._ruta_indice = os.path.join(directorio, "indice.json")
+        self._lock = threading.Lock()
+        self._serie = None
+        self._marca = None
+        self._version = None
+        os.makedirs(directorio, exist_ok=True)
+        self.indice = self._leer_indice()
+
+    @classmethod
+    def desde_csv(cls, ruta="valores_limpio.csv", directorio=DIRECTORIO_ALMACEN):
+        # La primera vez el almacén se arma con el CSV completo; después sólo se le
+        # agregan filas, salvo que el CSV cambie
+        almacen = cls(directorio, origen=ruta)
+        almacen.sincronizar()
+        return almacen
+
+    def _firma_origen(self):
+        estado = os.stat(self.origen)
+        return {"mtime_ns": estado.st_mtime_ns, "tamanio": estado.st_size}
+
+    def sincronizar(self):
+        """Vuelve a armar el almacén si el CSV de origen cambió desde la última vez. Devuelve si lo rearmó."""
+        if self.origen is None:
+            return False
+        with self._lock:
+            self.indice = self._leer_indice()
+            try:
+                firma = self._firma_origen()
+            except FileNotFoundError:
+                # Sin el CSV sigue valiendo lo guardado; si no hay nada, que falle la lectura
+                if self.indice["segmentos"]:
+                    return False
+                raise
+            if firma == self.indice.get("origen"):
+                return False
+
+            df, _ = self.limpiar(pd.read_csv(self.origen), desde_cero=True)
+            if self.indice["segmentos"] and not df.empty:
+                # Las filas ingeridas sólo en el almacén, posteriores al CSV, se conservan
+                guardadas = self._leer_segmentos(self.indice["segmentos"])
+                df = pd.concat([df, guardadas[guardadas["fecha"] > df["fecha"].iloc[-1]]], ignore_index=True)
+            self._reemplazar(df, origen=firma, version=self.indice.get("version", 0) + 1,
+                             ultimo=self._ultimo(df) if not df.empty else None)
+            return True
+
+    def registrar_origen(self):
+        # Para cuando las filas recién agregadas también se escribieron al final del CSV de origen
+        with self._lock:
+            self.indice = self._leer_indice()
+            indice = dict(self.indice, origen=self._firma_origen())
+            self._guardar_indice(indice)
+            self.indice = indice
+
+    def _leer_indice(self):
+        try:
+            with open(self._ruta_indice) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"segmentos": [], "ultimo": None}
+
+    def _guardar_indice(self, indice):
+        temporal = f"{self._ruta_indice}.{threading.get_ident()}.tmp"
+        with open(temporal, "w") as f:
+            json.dump(indice, f, indent=1)
+        os.replace(temporal, self._ruta_indice)
+
+    def _escribir_segmento(self, df, numero):
+        archivo = f"segmento_{numero:06d}.parquet"
+        ruta = os.path.join(self.directorio, archivo)
+        temporal = f"{ruta}.{threading.get_ident()}.tmp"
+        df.to_parquet(temporal, index=False)
+        os.replace(temporal, ruta)
+        return {"archivo": archivo, "desde": str(df["fecha"].iloc[0].date()),
+                "hasta": str(df["fecha"].iloc[-1].date()), "filas": len(df)}
+
+    @staticmethod
+    def _proximo_numero(segmentos):
+        return int(segmentos[-1]["archivo"][9:15]) + 1 if segmentos else 0
+
+    @staticmethod
+    def _ultimo(df):
+        ultima = df.iloc[-1]
+        return {"fecha": str(ultima["fecha"].date()),
+                **{m: None if pd.isna(ultima[m]) else float(ultima[m]) for m in MONEDAS}}
+
+    @property
+    def filas(self):
+        return sum(s["filas"] for s in self.indice["segmentos"])
+
+    def limpiar(self, nuevas, desde_cero=False):
+        """Filas de `nuevas` listas para agregar: (DataFrame con fecha, monedas y Brecha, cantidad descartada).
+
+        Sólo mira las filas recibidas y el último estado guardado (ninguno con `desde_cero`).
+        """
+        if "fecha" not in nuevas.columns:
+            raise ValueError("falta la columna 'fecha'")
+        df = pd.DataFrame({"fecha": pd.to_datetime(nuevas["fecha"], errors="coerce").dt.normalize()})
+        for moneda in MONEDAS:
+            valores = pd.to_numeric(nuevas[moneda], errors="coerce") if moneda in nuevas.columns else np.nan
+            df[moneda] = valores
+        df[MONEDAS] = df[MONEDAS].where(df[MONEDAS] > 0)
+
+        ultimo = None if desde_cero else self.indice["ultimo"]
+        validas = df["fecha"].notna() & df[MONEDAS].notna().any(axis=1)
+        if ultimo is not None:
+            validas &= df["fecha"] > pd.Timestamp(ultimo["fecha"])
+        df = df[validas].drop_duplicates("fecha", keep="last").sort_values("fecha", ignore_index=True)
+        descartadas = len(nuevas) - len(df)
+
+        # Los huecos se completan desde la última fila guardada, no desde el principio
+        if ultimo is not None and not df.empty:
+            estado = pd.DataFrame([{m: ultimo[m] for m in MONEDAS}], dtype=float)
+            df[MONEDAS] = pd.concat([estado, df[MONEDAS]], ignore_index=True).ffill().iloc[1:].to_numpy()
+        else:
+            df[MONEDAS] = df[MONEDAS].ffill()
+        df[MONEDAS] = df[MONEDAS].astype(np.float32)
+        df["Brecha"] = calcular_brecha(df["USD CCL"].to_numpy(), df["OFICIAL"].to_numpy())
+        return df, descartadas
+
+    def agregar(self, nuevas):
+        """Limpia y guarda las filas nuevas como un segmento más. Devuelve (filas agregadas, cantidad descartada)."""
+        with self._lock:
+            self.indice = self._leer_indice()
+            df, descartadas = self.limpiar(nuevas)
+            if df.empty:
+                return df, descartadas
+            segmentos = self.indice["segmentos"]
+            segmentos = segmentos + [self._escribir_segmento(df, self._proximo_numero(segmentos))]
+            indice = dict(self.indice, segmentos=segmentos, ultimo=self._ultimo(df))
+            self._guardar_indice(indice)
+            self.indice = indice
+            if len(segmentos) > MAX_SEGMENTOS:
+                self._compactar()
+            return df, descartadas
+
+    def _compactar(self):
+        # Reescribe todo en un segmento; los lectores siguen por cantidad de filas, no por archivo
+        self._reemplazar(self._leer_segmentos(self.indice["segmentos"]))
+
+    def _reemplazar(self, df, **cambios):
+        # Un solo segmento nuevo con `df` en lugar de todos los anteriores, que se borran
+        # después de guardar el índice; los números nuevos no pisan a los viejos
+        viejos = self.indice["segmentos"]
+        segmentos = [self._escribir_segmento(df, self._proximo_numero(viejos))] if not df.empty else []
+        indice = dict(self.indice, segmentos=segmentos, **cambios)
+        self._guardar_indice(indice)
+        self.indice = indice
+        for segmento in viejos:
+            try:
+                os.remove(os.path.join(self.directorio, segmento["archivo"]))
+            except FileNotFoundError:
+                pass
+
+    def _leer_segmentos(self, segmentos):
+        partes = [pd.read_parquet(os.path.join(self.directorio, s["archivo"])) for s in segmentos]
+        return pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=["fecha", *MONEDAS, "Brecha"])
+
+    def leer(self):
+        with self._lock:
+            return self._leer_segmentos(self._leer_indice()["segmentos"])
+
+    def serie(self):
+        """SerieDolar con todo lo guardado. Entre llamadas sólo se leen los segmentos nuevos.
+
+        Si el almacén tiene `origen`, antes se fija (con un stat) si el CSV cambió.
+        """
+        self.sincronizar()
+        with self._lock:
+            try:
+                marca = os.stat(self._ruta_indice).st_mtime_ns
+            except FileNotFoundError:
+                marca = None
+            if self._serie is not None and marca == self._marca:
+                return self._serie
+            self.indice = self._leer_indice()
+            self._marca = marca
+            if self.indice.get("version", 0) != self._version:
+                # Se rearmó desde el CSV: lo ya cargado puede no coincidir
+                self._serie = None
+                self._version = self.indice.get("version", 0)
+            cargadas = 0 if self._serie is None else len(self._serie.fechas)
+
+            # Segmentos que contienen filas posteriores a las ya cargadas
+            pendientes, inicio, salto = [], 0, 0
+            for segmento in self.indice["segmentos"]:
+                if inicio + segmento["filas"] > cargadas:
+                    if not pendientes:
+                        salto = cargadas - inicio
+                    pendientes.append(segmento)
+                inicio += segmento["filas"]
+            if not pendientes:
+                return self._serie
+            df = self._leer_segmentos(pendientes).iloc[salto:]
+
+            fechas = df["fecha"].to_numpy(dtype="datetime64[ns]")
+            valores = df[MONEDAS].to_numpy(dtype=np.float32)
+            brecha = df["Brecha"].to_numpy(dtype=np.float32)
+            if self._serie is None:
+                self._serie = SerieDolar(fechas, valores, MONEDAS, brecha)
+            else:
+                self._serie = self._serie.extender(fechas, valores, brecha)
+            return self._serie
+
+
+def agregar_a_csv(df, ruta):
+    # Las filas ya limpias se agregan al final del CSV, sin reescribirlo
+    nuevo = not os.path.exists(ruta)
+    df.assign(fecha=df["fecha"].dt.strftime("%Y-%m-%d")).to_csv(
+        ruta, mode="a", header=nuevo, index=False, columns=["fecha", *MONEDAS, "Brecha"]
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Agrega cotizaciones nuevas al almacén de la serie del dólar.")
+    parser.add_argument("archivo", help="CSV con fecha y las columnas de monedas de valores_limpio.csv")
+    parser.add_argument("--almacen", default=DIRECTORIO_ALMACEN, help="directorio del almacén de segmentos")
+    parser.add_argument("--base", default="valores_limpio.csv", help="CSV con el que se arma el almacén si está vacío")
+    parser.add_argument("--csv", help="CSV al que también se le agregan las filas limpias")
+    args = parser.parse_args(argv)
+
+    almacen = AlmacenDolar.desde_csv(args.base, args.almacen)
+    try:
+        df, descartadas = almacen.agregar(pd.read_csv(args.archivo))
+    except (OSError, ValueError, pd.errors.ParserError) as e:
+        parser.error(f"no se pudo leer {args.archivo}: {e}")
+    if args.csv and not df.empty:
+        agregar_a_csv(df, args.csv)
+        if os.path.abspath(args.csv) == os.path.abspath(args.base):
+            # El CSV cambió sólo con las filas que ya están en el almacén: no hace falta rearmarlo
+            almacen.registrar_origen()
+    print(f"{len(df)} filas agregadas, {descartadas} descartadas; "
+          f"{almacen.filas} filas en {len(almacen.indice['segmentos'])} segmentos "
+          f"(hasta {almacen.indice['ultimo']['fecha'] if almacen.indice['ultimo'] else '-'})")
+
+
+if __name__ == "__main__":
+    main()
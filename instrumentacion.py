@@ -0,0 +1,163 @@
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+# Límites (ms) de los histogramas acumulados que se exportan en formato OpenMetrics
+LIMITES_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+COLUMNAS = ["tipo", "nombre", "ms", "error", "filas", "columnas", "bytes"]
+
+_registro = contextvars.ContextVar("registro", default=None)
+_ruta = contextvars.ContextVar("ruta", default=())
+
+
+class Acumulado:
+    """Totales del proceso desde que arrancó: cantidad, suma e histograma por (tipo, nombre)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.series = {}
+
+    def agregar(self, tipo, nombre, ms=None, error=None):
+        with self._lock:
+            serie = self.series.setdefault((tipo, nombre), {"cantidad": 0, "errores": 0, "suma_ms": 0.0,
+                                                            "buckets": [0] * len(LIMITES_MS)})
+            serie["cantidad"] += 1
+            serie["errores"] += error is not None
+            if ms is not None:
+                serie["suma_ms"] += ms
+                for i, limite in enumerate(LIMITES_MS):
+                    if ms <= limite:
+                        serie["buckets"][i] += 1
+
+    def openmetrics(self):
+        """Texto en formato OpenMetrics con un histograma por tipo de evento y los eventos sin duración como contadores."""
+        with self._lock:
+            series = {clave: dict(valor, buckets=list(valor["buckets"])) for clave, valor in self.series.items()}
+        lineas = []
+        for tipo in sorted({t for t, _ in series}):
+            metrica = f"informe_{tipo}"
+            del_tipo = [(nombre, valor) for (t, nombre), valor in sorted(series.items()) if t == tipo]
+            etiquetas = ['nombre="{}"'.format(n.replace("\\", "\\\\").replace('"', '\\"')) for n, _ in del_tipo]
+            if any(valor["suma_ms"] for _, valor in del_tipo):
+                lineas.append(f"# TYPE {metrica}_segundos histogram")
+                for etiqueta, (_, valor) in zip(etiquetas, del_tipo):
+                    for limite, cantidad in zip(LIMITES_MS, valor["buckets"]):
+                        lineas.append(f'{metrica}_segundos_bucket{{{etiqueta},le="{limite / 1000:g}"}} {cantidad}')
+                    lineas.append(f'{metrica}_segundos_bucket{{{etiqueta},le="+Inf"}} {valor["cantidad"]}')
+                    lineas.append(f"{metrica}_segundos_count{{{etiqueta}}} {valor['cantidad']}")
+                    lineas.append(f"{metrica}_segundos_sum{{{etiqueta}}} {valor['suma_ms'] / 1000:.6f}")
+            else:
+                lineas.append(f"# TYPE {metrica} counter")
+                for etiqueta, (_, valor) in zip(etiquetas, del_tipo):
+                    lineas.append(f"{metrica}_total{{{etiqueta}}} {valor['cantidad']}")
+            lineas.append(f"# TYPE {metrica}_errores counter")
+            for etiqueta, (_, valor) in zip(etiquetas, del_tipo):
+                lineas.append(f"{metrica}_errores_total{{{etiqueta}}} {valor['errores']}")
+        lineas.append("# EOF")
+        return "\n".join(lineas) + "\n"
+
+
+ACUMULADO = Acumulado()
+
+
+class Registro:
+    """Eventos de un rerun: etapas, llamadas al proveedor, aciertos de cache y tamaños de DataFrames.
+
+    Se activa con `iniciar_registro` al principio del script; las funciones
+    de este módulo anotan en el registro activo del contexto actual y,
+    siempre, en ACUMULADO.
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.eventos = []
+        self._lock = threading.Lock()
+
+    def anotar(self, tipo, nombre, ms=None, error=None, filas=None, columnas=None, bytes_=None):
+        with self._lock:
+            self.eventos.append((tipo, nombre, ms, error, filas, columnas, bytes_))
+
+    def a_dataframe(self):
+        import pandas as pd
+
+        with self._lock:
+            return pd.DataFrame(self.eventos, columns=COLUMNAS)
+
+    def resumen(self):
+        """Cantidad, ms totales y ms máximos por tipo y nombre de evento."""
+        import pandas as pd
+
+        df = self.a_dataframe()
+        if df.empty:
+            return pd.DataFrame(columns=["cantidad", "errores", "ms total", "ms máximo"])
+        return df.groupby(["tipo", "nombre"], sort=False).agg(**{
+            "cantidad": ("nombre", "size"),
+            "errores": ("error", "count"),
+            "ms total": ("ms", "sum"),
+            "ms máximo": ("ms", "max"),
+        })
+
+    def a_json(self):
+        df = self.a_dataframe()
+        return json.dumps({
+            "duracion_ms": (time.perf_counter() - self.inicio) * 1000,
+            "eventos": json.loads(df.to_json(orient="records")),
+        }, ensure_ascii=False, indent=1)
+
+
+def iniciar_registro():
+    registro = Registro()
+    _registro.set(registro)
+    _ruta.set(())
+    return registro
+
+
+def registro_actual():
+    return _registro.get()
+
+
+def _anotar(tipo, nombre, ms=None, error=None, **tamanios):
+    ACUMULADO.agregar(tipo, nombre, ms, error)
+    registro = _registro.get()
+    if registro is not None:
+        registro.anotar(tipo, nombre, ms, error, **tamanios)
+
+
+@contextmanager
+def etapa(nombre):
+    """Mide el tiempo de pared de un bloque. Las etapas anidadas se nombran "Sección/etapa"."""
+    ruta = _ruta.get() + (nombre,)
+    token = _ruta.set(ruta)
+    inicio = time.perf_counter()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        _ruta.reset(token)
+        _anotar("etapa", "/".join(ruta), (time.perf_counter() - inicio) * 1000, error)
+
+
+def llamada(metodo, ms, error=None):
+    # Pedido que efectivamente llegó al proveedor (Yahoo Finance, feeds o la reproducción local)
+    _anotar("llamada", metodo, ms, error)
+
+
+def cache(nombre, resultado, cantidad=1):
+    # `resultado` es "acierto", "fallo", "agrupado", "cola" (sólo se pidió la última barra)
+    # o "ajuste" (el histórico guardado cambió de base y se volvió a descargar)
+    for _ in range(cantidad):
+        _anotar("cache", f"{nombre}:{resultado}")
+
+
+def tamanio(nombre, df):
+    """Filas, columnas y bytes de un DataFrame en la etapa actual; lo devuelve sin cambios."""
+    if df is not None:
+        ruta = "/".join(_ruta.get() + (nombre,))
+        _anotar("dataframe", ruta, filas=len(df), columnas=df.shape[1] if df.ndim > 1 else 1,
+                bytes_=int(df.memory_usage(deep=True).sum()) if df.ndim > 1 else int(df.memory_usage(deep=True)))
+    return df
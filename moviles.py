@@ -0,0 +1,179 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from riesgo import RUEDAS_ANIO
+
+# Ventanas (en filas: ruedas o días de cotización) de todas las estadísticas móviles
+VENTANAS_MOVILES = {"20 ruedas": 20, "50 ruedas": 50, "200 ruedas": 200}
+
+
+def _sumas_moviles(valores, ventana):
+    """Suma de las últimas `ventana` filas de cada columna, con una suma acumulada.
+
+    Devuelve una matriz del mismo largo que `valores`; queda NaN mientras la
+    ventana no esté completa o si alguna fila de la ventana es NaN.
+    """
+    validos = ~np.isnan(valores)
+    ceros = np.zeros((1,) + valores.shape[1:])
+    acumulada = np.concatenate([ceros, np.cumsum(np.where(validos, valores, 0.0), axis=0)])
+    cantidad = np.concatenate([ceros, np.cumsum(validos, axis=0)])
+    sumas = np.full(valores.shape, np.nan)
+    if len(valores) >= ventana:
+        completas = cantidad[ventana:] - cantidad[:-ventana] == ventana
+        sumas[ventana - 1:] = np.where(completas, acumulada[ventana:] - acumulada[:-ventana], np.nan)
+    return sumas
+
+
+def media_movil(valores, ventana):
+    return _sumas_moviles(np.asarray(valores, dtype=np.float64), ventana) / ventana
+
+
+def desvio_movil(valores, ventana):
+    # Desvío muestral con sumas de valores y de cuadrados; pensado para retornos, de media cercana a cero
+    valores = np.asarray(valores, dtype=np.float64)
+    suma = _sumas_moviles(valores, ventana)
+    cuadrados = _sumas_moviles(valores * valores, ventana)
+    return np.sqrt(np.maximum(cuadrados - suma * suma / ventana, 0) / (ventana - 1))
+
+
+def correlacion_movil(x, y, ventana):
+    """Correlación móvil de cada columna de `x` con la misma columna de `y`.
+
+    Las filas en que falta alguno de los dos valores no cuentan como completas.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    faltantes = np.isnan(x) | np.isnan(y)
+    x = np.where(faltantes, np.nan, x)
+    y = np.where(faltantes, np.nan, y)
+    sx, sy = _sumas_moviles(x, ventana), _sumas_moviles(y, ventana)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covarianza = _sumas_moviles(x * y, ventana) - sx * sy / ventana
+        varianza_x = _sumas_moviles(x * x, ventana) - sx * sx / ventana
+        varianza_y = _sumas_moviles(y * y, ventana) - sy * sy / ventana
+        return np.clip(covarianza / np.sqrt(varianza_x * varianza_y), -1, 1)
+
+
+def media_exponencial(niveles, ventana, semilla=None):
+    """Media móvil exponencial (span = `ventana`) de cada columna.
+
+    Con `semilla` (el último valor ya calculado) continúa la recursión desde
+    ahí, así que extender una serie da lo mismo que recalcularla entera.
+    """
+    if semilla is not None:
+        niveles = pd.concat([pd.DataFrame([semilla], columns=niveles.columns), niveles])
+    resultado = niveles.ewm(span=ventana, adjust=False).mean()
+    return resultado.iloc[1:] if semilla is not None else resultado
+
+
+class EstadisticasMoviles:
+    """Medias, volatilidad, EWMA y correlaciones móviles de un conjunto de series de precios.
+
+    Se calcula una vez para todas las ventanas de VENTANAS_MOVILES y se
+    actualiza por el final: si los precios nuevos extienden a los ya vistos
+    (mismas columnas y las mismas fechas al principio), sólo se recalculan
+    las filas nuevas y la última conocida, que puede haber cambiado, usando
+    como contexto las `max(ventana)` filas anteriores y el último EWMA.
+
+    Las columnas de `sin_retornos` (por ejemplo, la brecha, que ya es un
+    porcentaje) sólo tienen media y EWMA, sin volatilidad ni correlaciones.
+    """
+
+    def __init__(self, ventanas=tuple(VENTANAS_MOVILES.values()), sin_retornos=()):
+        self.ventanas = tuple(ventanas)
+        self.sin_retornos = set(sin_retornos)
+        self.precios = None
+        self.columnas = {}
+        self.filas_calculadas = 0
+        self._valores = {}
+        self._lock = threading.RLock()
+
+    def _vigentes(self, precios):
+        # Filas de los resultados guardados que siguen valiendo para `precios`
+        if self.precios is None or not precios.columns.equals(self.precios.columns):
+            return 0
+        previas = len(self.precios)
+        if len(precios) < previas or not precios.index[:previas].equals(self.precios.index):
+            return 0
+        return max(previas - 1, 0)
+
+    def _calcular(self, precios, desde):
+        contexto = max(self.ventanas) + 1
+        bloque = precios.iloc[max(desde - contexto, 0):]
+        recorte = desde - max(desde - contexto, 0)
+        valores = bloque.to_numpy(dtype=np.float64)
+        columnas = list(precios.columns)
+        con_retornos = [c for c in columnas if c not in self.sin_retornos]
+        precios_retornos = bloque[con_retornos].to_numpy(dtype=np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            retornos = np.vstack([np.full((1, len(con_retornos)), np.nan), precios_retornos[1:] / precios_retornos[:-1] - 1])
+
+        pares = [(i, j) for i in range(len(con_retornos)) for j in range(i + 1, len(con_retornos))]
+        izquierda = [i for i, _ in pares]
+        derecha = [j for _, j in pares]
+        self.columnas = {
+            "media": columnas,
+            "ewma": columnas,
+            "volatilidad": con_retornos,
+            "correlacion": [f"{con_retornos[i]} / {con_retornos[j]}" for i, j in pares],
+        }
+
+        nuevos = {}
+        for ventana in self.ventanas:
+            nuevos["media", ventana] = media_movil(valores, ventana)[recorte:]
+            nuevos["volatilidad", ventana] = (desvio_movil(retornos, ventana) * np.sqrt(RUEDAS_ANIO) * 100)[recorte:]
+            nuevos["correlacion", ventana] = correlacion_movil(retornos[:, izquierda], retornos[:, derecha], ventana)[recorte:]
+            semilla = self._valores["ewma", ventana][desde - 1] if desde else None
+            nuevos["ewma", ventana] = media_exponencial(precios.iloc[desde:], ventana, semilla).to_numpy()
+        return nuevos
+
+    def actualizar(self, precios):
+        """Incorpora `precios` (fechas x series) y devuelve self; sin cambios no recalcula nada."""
+        precios = precios.sort_index()
+        with self._lock:
+            desde = self._vigentes(precios)
+            if desde and len(precios) == len(self.precios) and precios.iloc[-1:].equals(self.precios.iloc[-1:]):
+                return self
+            nuevos = self._calcular(precios, desde)
+            if desde:
+                nuevos = {clave: np.concatenate([self._valores[clave][:desde], valores]) for clave, valores in nuevos.items()}
+            self._valores = nuevos
+            self.precios = precios
+            self.filas_calculadas = len(precios) - desde
+            return self
+
+    def _tabla(self, tipo, ventana):
+        # Bajo el lock: otra sesión puede estar incorporando barras nuevas
+        with self._lock:
+            return pd.DataFrame(self._valores[tipo, ventana], index=self.precios.index, columns=self.columnas[tipo])
+
+    def media(self, ventana):
+        return self._tabla("media", ventana)
+
+    def volatilidad(self, ventana):
+        # Volatilidad anualizada (%) de los retornos diarios simples
+        return self._tabla("volatilidad", ventana)
+
+    def ewma(self, ventana):
+        return self._tabla("ewma", ventana)
+
+    def correlacion(self, ventana):
+        # Una columna por par de series, "A / B"
+        return self._tabla("correlacion", ventana)
+
+    def tabla(self, ventana):
+        """Último valor de cada serie con su media, EWMA y volatilidad en la ventana."""
+        with self._lock:
+            if self.precios is None or self.precios.empty:
+                return pd.DataFrame()
+            ultimo = self.precios.ffill().iloc[-1]
+            media = self.media(ventana).iloc[-1]
+            return pd.DataFrame({
+                "Último": ultimo,
+                f"Media {ventana}": media,
+                "Distancia a la media (%)": (ultimo / media - 1) * 100,
+                f"EWMA {ventana}": self.ewma(ventana).iloc[-1],
+                f"Volatilidad {ventana} (% anual)": self.volatilidad(ventana).iloc[-1].reindex(ultimo.index),
+            })
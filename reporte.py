@@ -0,0 +1,170 @@
+"""Genera el Informe Económico Semanal sin Streamlit.
+
+    python reporte.py --salida informe_semanal --cartera cartera.csv
+
+Calcula dólar, evolución de activos, valuación de la cartera, alertas y
+titulares en un solo proceso (los históricos se descargan una vez y se
+comparten entre secciones) y escribe informe.html junto con los datos de
+cada sección en CSV o Parquet, listos para servir como archivos estáticos.
+"""
+import argparse
+import html
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from cache_precios import CachePrecios
+from datos import ACTIVOS_EVOLUCION, alinear_cierres, proveedor_por_defecto
+from dolar import MONEDAS, SerieDolar
+from graficos import reducir, reducir_series
+from titulares import AlmacenTitulares
+from valuacion import alertas_cartera, resumen_cartera, valuar_cartera
+
+
+def calcular_informe(cache, serie_dolar, almacen=None, activos=None, periodo="365d", cartera=None):
+    activos = activos or list(ACTIVOS_EVOLUCION)
+    informe = {"generado": datetime.now()}
+
+    # Dólar
+    informe["dolar"] = pd.DataFrame([serie_dolar.cotizacion(serie_dolar.fecha_max)], index=[serie_dolar.fecha_max.date()])
+    informe["dolar_historico"] = serie_dolar.ventana("365 días")
+
+    # Evolución de activos
+    tickers = [ACTIVOS_EVOLUCION[nombre] for nombre in activos]
+    cierres = cache.historiales(tickers, periodo)
+    cierres = cierres.rename(columns={ACTIVOS_EVOLUCION[n]: n for n in activos}).dropna(axis=1, how="all")
+    if not cierres.empty:
+        precios, ultimos, rendimientos = alinear_cierres(cierres)
+        informe["evolucion"] = precios
+        informe["rendimientos"] = pd.DataFrame({"Precio": ultimos, "Rendimiento (%)": rendimientos})
+
+    # Cartera y alertas (misma valuación para ambas)
+    if cartera is not None:
+        valuados, historico = valuar_cartera(cartera, cache)
+        informe["cartera"] = valuados
+        informe["historico_cartera"] = historico
+        if not valuados.empty:
+            informe["resumen_cartera"] = resumen_cartera(valuados)
+            informe["alertas"] = alertas_cartera(valuados)
+
+    # Titulares
+    if almacen is not None:
+        almacen.actualizar_si_corresponde()
+        informe["titulares"] = almacen.recientes(cantidad=20)
+    return informe
+
+
+def _tabla(df, **kwargs):
+    return df.to_html(classes="tabla", border=0, float_format=lambda x: f"{x:,.2f}", **kwargs)
+
+
+def _grafico(fig, primero):
+    fig.update_layout(xaxis_title="", yaxis_title="", margin=dict(l=10, r=10, t=30, b=10))
+    return fig.to_html(full_html=False, include_plotlyjs="cdn" if primero else False)
+
+
+def _tabla_alertas(alertas):
+    filas = [{"Tipo": "Concentración mayor al 30%", "Ticker": r["Ticker"], "Valor (%)": r["% cartera"]}
+             for _, r in alertas["concentrados"].iterrows()]
+    filas += [{"Tipo": "Caída mayor al 20%", "Ticker": r["Ticker"], "Valor (%)": r["Rendimiento (%)"]}
+              for _, r in alertas["perdedores"].iterrows()]
+    if alertas["rendimiento_bajo"]:
+        filas.append({"Tipo": "Rendimiento total inferior al 5%", "Ticker": "", "Valor (%)": None})
+    return pd.DataFrame(filas, columns=["Tipo", "Ticker", "Valor (%)"])
+
+
+def escribir_informe(informe, salida, formato="csv"):
+    import plotly.express as px
+
+    os.makedirs(salida, exist_ok=True)
+
+    def guardar(nombre, df, index=True):
+        ruta = os.path.join(salida, f"{nombre}.{formato}")
+        if formato == "parquet":
+            df.to_parquet(ruta, index=index)
+        else:
+            df.to_csv(ruta, index=index)
+
+    partes = [f"<h1>📊 Informe Económico Semanal</h1><p>Generado el {informe['generado']:%d/%m/%Y %H:%M}</p>"]
+    graficos = 0
+
+    partes.append("<h2>💵 Cotización del dólar</h2>" + _tabla(informe["dolar"]))
+    guardar("dolar", informe["dolar_historico"], index=False)
+    historico = informe["dolar_historico"]
+    fig = px.line(reducir_series(historico, "fecha", MONEDAS), x="fecha", y="value", color="variable")
+    partes.append(_grafico(fig, graficos == 0))
+    graficos += 1
+    fig = px.line(reducir(historico, "fecha", "Brecha"), x="fecha", y="Brecha", title="Brecha USD CCL vs Oficial")
+    partes.append(_grafico(fig, False))
+
+    if "evolucion" in informe:
+        evolucion = informe["evolucion"]
+        guardar("evolucion", evolucion)
+        guardar("rendimientos", informe["rendimientos"])
+        largo = reducir_series(evolucion.reset_index(), "Fecha", list(evolucion.columns), var_name="Activo", value_name="Valor")
+        partes.append("<h2>📈 Evolución de activos</h2>")
+        partes.append(_grafico(px.line(largo, x="Fecha", y="Valor", color="Activo"), False))
+        partes.append(_tabla(informe["rendimientos"]))
+
+    if "resumen_cartera" in informe:
+        resumen = informe["resumen_cartera"]
+        guardar("cartera", informe["cartera"])
+        guardar("historico_cartera", informe["historico_cartera"])
+        partes.append("<h2>💼 Valuación del portafolio</h2>")
+        partes.append(_tabla(pd.DataFrame([resumen])))
+        partes.append(_tabla(informe["cartera"], index=False))
+        total = reducir(informe["historico_cartera"].reset_index(), "Fecha", "Total")
+        partes.append(_grafico(px.line(total, x="Fecha", y="Total"), False))
+
+        alertas = _tabla_alertas(informe["alertas"])
+        guardar("alertas", alertas, index=False)
+        partes.append("<h2>⚠️ Alertas automatizadas</h2>")
+        partes.append(_tabla(alertas, index=False) if not alertas.empty else "<p>Sin alertas.</p>")
+
+    if informe.get("titulares") is not None and not informe["titulares"].empty:
+        titulares = informe["titulares"]
+        guardar("titulares", titulares, index=False)
+        partes.append("<h2>📰 Titulares económicos</h2><ul>")
+        for t in titulares.itertuples():
+            partes.append(f'<li><a href="{html.escape(t.link)}">{html.escape(t.titulo)}</a> — {html.escape(t.temas)}</li>')
+        partes.append("</ul>")
+
+    pagina = ("<!DOCTYPE html><html lang='es'><head><meta charset='utf-8'>"
+              "<title>Informe Económico Semanal</title>"
+              "<style>body{font-family:sans-serif;max-width:1100px;margin:auto}"
+              ".tabla{border-collapse:collapse}.tabla td,.tabla th{padding:4px 10px;text-align:right}</style>"
+              "</head><body>" + "\n".join(partes) + "</body></html>")
+    ruta = os.path.join(salida, "informe.html")
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write(pagina)
+    return ruta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera el Informe Económico Semanal sin Streamlit.")
+    parser.add_argument("--salida", default="informe_semanal", help="directorio donde se escribe el informe")
+    parser.add_argument("--cartera", help="CSV con columnas Ticker, Fecha, Cantidad")
+    parser.add_argument("--activos", help="nombres separados por coma (por defecto, todos)")
+    parser.add_argument("--periodo", default="365d", choices=["7d", "30d", "90d", "180d", "365d", "max"])
+    parser.add_argument("--formato", default="csv", choices=["csv", "parquet"])
+    parser.add_argument("--sin-titulares", action="store_true", help="no consultar los feeds de noticias")
+    args = parser.parse_args(argv)
+
+    cartera = pd.read_csv(args.cartera).to_dict(orient="records") if args.cartera else None
+    activos = [a.strip() for a in args.activos.split(",")] if args.activos else None
+    proveedor = proveedor_por_defecto()
+    informe = calcular_informe(
+        CachePrecios(proveedor),
+        SerieDolar.desde_csv("valores_limpio.csv"),
+        almacen=None if args.sin_titulares else AlmacenTitulares(proveedor=proveedor),
+        activos=activos,
+        periodo=args.periodo,
+        cartera=cartera,
+    )
+    ruta = escribir_informe(informe, args.salida, args.formato)
+    print(f"Informe generado en {ruta}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+RUEDAS_ANIO = 252
+BENCHMARK = "^GSPC"
+
+
+def matriz_retornos(cierres):
+    """Retornos diarios simples de todos los activos, alineados por fecha.
+
+    Los precios se completan hacia adelante para que un feriado de un mercado
+    no genere huecos; antes de que un activo cotice el retorno queda en NaN.
+    """
+    precios = cierres.sort_index().ffill()
+    return precios.pct_change(fill_method=None).iloc[1:]
+
+
+def max_drawdown(cierres):
+    precios = cierres.sort_index().ffill()
+    return (precios / precios.cummax() - 1).min()
+
+
+def _cola(valores, nivel):
+    # Cuantil inferior y promedio de la cola por columna, ignorando NaN
+    cuantil = np.nanquantile(valores, 1 - nivel, axis=0)
+    en_cola = np.where(valores <= cuantil, valores, np.nan)
+    with np.errstate(invalid="ignore"):
+        return cuantil, np.nanmean(en_cola, axis=0)
+
+
+def correlaciones(retornos):
+    """Correlación de a pares (como DataFrame.corr) con productos de matrices.
+
+    Cada par usa sólo las fechas en que ambos activos tienen retorno.
+    """
+    valores = retornos.to_numpy(dtype=np.float64)
+    validos = (~np.isnan(valores)).astype(np.float64)
+    x = np.nan_to_num(valores)
+    n = validos.T @ validos
+    suma = x.T @ validos
+    suma_cuadrados = (x * x).T @ validos
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covarianza = x.T @ x - suma * suma.T / n
+        varianza = suma_cuadrados - suma ** 2 / n
+        matriz = covarianza / np.sqrt(varianza * varianza.T)
+    matriz[n < 2] = np.nan
+    return pd.DataFrame(np.clip(matriz, -1, 1), index=retornos.columns, columns=retornos.columns)
+
+
+def metricas_riesgo(cierres, pesos, benchmark=None, nivel=0.95):
+    """Volatilidad, drawdown, VaR/CVaR (histórico y paramétrico), beta y correlaciones.
+
+    `cierres` tiene una columna por ticker y `pesos` la valuación actual de
+    cada uno. La cartera se trata como una columna más, con retornos
+    ponderados por esos pesos, así que todo se resuelve en pocas operaciones
+    sobre la misma matriz. VaR y CVaR son a un día y se expresan en %.
+    Devuelve (tabla de métricas, matriz de correlación).
+    """
+    retornos = matriz_retornos(cierres)
+    pesos = pd.Series(pesos, dtype=float).reindex(retornos.columns).fillna(0)
+    pesos = pesos / pesos.sum() if pesos.sum() else pesos
+    retornos["Cartera"] = retornos.fillna(0).to_numpy() @ pesos.to_numpy()
+    precios = cierres.sort_index().ffill()
+    precios["Cartera"] = (1 + retornos["Cartera"]).cumprod()
+
+    valores = retornos.to_numpy()
+    media = np.nanmean(valores, axis=0)
+    desvio = np.nanstd(valores, axis=0, ddof=1)
+    var_hist, cvar_hist = _cola(valores, nivel)
+    z = NormalDist().inv_cdf(1 - nivel)
+    densidad = NormalDist().pdf(z)
+
+    tabla = pd.DataFrame({
+        "Volatilidad anual (%)": desvio * np.sqrt(RUEDAS_ANIO) * 100,
+        "Máx. drawdown (%)": max_drawdown(precios).reindex(retornos.columns).to_numpy() * 100,
+        f"VaR histórico {nivel:.0%} (%)": -var_hist * 100,
+        f"CVaR histórico {nivel:.0%} (%)": -cvar_hist * 100,
+        f"VaR paramétrico {nivel:.0%} (%)": -(media + z * desvio) * 100,
+        f"CVaR paramétrico {nivel:.0%} (%)": -(media - desvio * densidad / (1 - nivel)) * 100,
+    }, index=retornos.columns)
+
+    if benchmark is not None and not benchmark.empty:
+        mercado = matriz_retornos(benchmark.to_frame()).iloc[:, 0].reindex(retornos.index).to_numpy()
+        validos = ~np.isnan(valores) & ~np.isnan(mercado)[:, None]
+        n = validos.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            m = np.where(validos, mercado[:, None], 0)
+            r = np.where(validos, valores, 0)
+            media_m = m.sum(axis=0) / n
+            media_r = r.sum(axis=0) / n
+            covarianza = ((r - media_r) * (m - media_m) * validos).sum(axis=0)
+            varianza = (((m - media_m) ** 2) * validos).sum(axis=0)
+            tabla["Beta"] = covarianza / varianza
+
+    return tabla, correlaciones(retornos.drop(columns="Cartera"))
@@ -0,0 +1,6 @@
+"""Una sección del informe por módulo.
+
+informe.py importa sólo el módulo de la sección elegida en la barra
+lateral, así plotly, yfinance o feedparser no se cargan hasta que alguna
+sección los necesita.
+"""
@@ -0,0 +1,99 @@
+from datetime import datetime
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from instrumentacion import etapa
+from riesgo import BENCHMARK, metricas_riesgo
+from secciones.recursos import clave_cartera, obtener_cache_precios, valuar_cartera_cacheada
+from valuacion import alertas_cartera, cartera_a_lotes, cierres_cartera, resumen_cartera, valuar_lotes
+
+
+@st.cache_data(ttl=900)
+def analizar_riesgo_cacheado(cartera, fecha):
+    # `fecha` forma parte de la clave: las métricas se recalculan una vez por día
+    lotes = cartera_a_lotes([{"Ticker": t, "Fecha": f, "Cantidad": c} for t, f, c in cartera])
+    cache = obtener_cache_precios()
+    cierres = cierres_cartera(lotes, cache)
+    valuados = valuar_lotes(lotes, cierres)
+    if valuados.empty:
+        return pd.DataFrame(), pd.DataFrame()
+    benchmark = cache.historial(BENCHMARK, inicio=lotes["Fecha"].min())["Close"]
+    return metricas_riesgo(cierres, valuados.groupby("Ticker")["Valuación actual"].sum(), benchmark)
+
+def seccion_analisis():
+    st.subheader("🧠 Análisis automático")
+    st.markdown("🔍 **Análisis generado por IA**")
+
+    # Requiere que exista una cartera ya cargada
+    if "cartera" not in st.session_state or not st.session_state.cartera:
+        st.warning("Cargá primero tu cartera en la sección 'Valuación de portafolio'.")
+        return
+
+    # Cálculo total (compartido con "Valuación de portafolio")
+    with etapa("valuación"):
+        df_resultados, _ = valuar_cartera_cacheada(clave_cartera(st.session_state.cartera))
+
+    if df_resultados.empty:
+        st.warning("No se pudieron obtener datos de valuación para los activos.")
+        return
+
+    resumen = resumen_cartera(df_resultados)
+    alertas = alertas_cartera(df_resultados)
+    df_resultados = df_resultados.sort_values("Rendimiento (%)", ascending=False)
+    top_rendimiento = df_resultados.head(3)["Ticker"].tolist()
+
+    # ---- SECCIÓN 1: Análisis general
+    st.markdown("### 💡 Análisis generado por IA")
+    delta = resumen["Rendimiento (%)"]
+    ganancia_usd = resumen["Ganancia / Pérdida"]
+
+    st.markdown(f"""
+- 📈 En base a tu portafolio actual, obtuviste un rendimiento total de **{delta:.2f}%** desde la fecha de adquisición de tus activos, con una ganancia neta de **${ganancia_usd:,.2f}**.
+- ✅ Los activos con mejor rendimiento fueron: **{', '.join(top_rendimiento)}**.
+- 📊 Comparado con un benchmark hipotético del 15% anual, tu portafolio {"superó" if delta > 15 else "quedó por debajo de"} esa referencia.
+""")
+
+    # ---- SECCIÓN 2: Alertas automatizadas
+    st.markdown("### ⚠️ Alertas automatizadas")
+
+    # 1. Alerta por concentración
+    concentrados = alertas["concentrados"]
+    if not concentrados.empty:
+        tickers_conc = ", ".join(concentrados["Ticker"].tolist())
+        st.warning(f"🎯 Los activos {tickers_conc} representan más del 30% del total del portafolio. Esto puede ser una exposición excesiva.")
+
+    # 2. Activos con pérdida mayor al 20%
+    perdedores = alertas["perdedores"]
+    if not perdedores.empty:
+        st.error("📉 Los siguientes activos tuvieron caídas mayores al 20%:")
+        for _, row in perdedores.iterrows():
+            st.markdown(f"- {row['Ticker']}: {row['Rendimiento (%)']:.2f}%")
+
+    # 3. Portafolio con rendimiento pobre
+    if alertas["rendimiento_bajo"]:
+        st.info("ℹ️ El rendimiento total de tu portafolio es inferior al 5%. Podría ser momento de revisar tu estrategia.")
+
+    # ---- Métricas de riesgo
+    st.markdown("### 📐 Métricas de riesgo")
+    with etapa("riesgo"):
+        tabla_riesgo, correlaciones = analizar_riesgo_cacheado(clave_cartera(st.session_state.cartera), str(datetime.now().date()))
+    if not tabla_riesgo.empty:
+        st.caption(f"VaR y CVaR a un día. Beta calculada contra {BENCHMARK}.")
+        st.dataframe(tabla_riesgo.style.format("{:.2f}"))
+        if len(correlaciones) > 1:
+            fig = px.imshow(correlaciones, text_auto=".2f", color_continuous_scale="RdBu_r", zmin=-1, zmax=1, title="Correlación de retornos diarios")
+            st.plotly_chart(fig, use_container_width=True)
+
+    # ---- SECCIÓN 3: Eventos económicos vinculados
+    noticias = st.session_state.get("titulares_destacados", [])
+
+    st.markdown("### 📰 Eventos económicos destacados que podrían haber influido:")
+    if noticias:
+        for n in noticias[:3]:
+            st.markdown(f"- {n}")
+    else:
+        st.info("No se detectaron eventos destacados para esta semana.")
+
+    st.caption(f"🤖 Análisis generado automáticamente el {datetime.now().strftime('%d/%m/%Y')}")
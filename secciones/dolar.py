@@ -0,0 +1,63 @@
+import plotly.express as px
+import streamlit as st
+
+from dolar import MONEDAS, VENTANAS
+from graficos import reducir_series
+from instrumentacion import etapa, tamanio
+from moviles import VENTANAS_MOVILES, EstadisticasMoviles
+from secciones.recursos import cargar_dolar
+
+
+@st.cache_resource
+def obtener_moviles_dolar():
+    # Compartidas entre sesiones: con cada cotización nueva sólo se calculan las filas agregadas
+    return EstadisticasMoviles(sin_retornos=["Brecha"])
+
+def seccion_dolar():
+    serie = cargar_dolar()
+    with etapa("estadísticas móviles"):
+        moviles = obtener_moviles_dolar().actualizar(serie.df.set_index("fecha")[MONEDAS + ["Brecha"]])
+
+    st.markdown("#### Cotización por fecha")
+    fecha = st.date_input("Seleccionar fecha:", value=serie.fecha_max, min_value=serie.fecha_min, max_value=serie.fecha_max)
+    fila = serie.cotizacion(fecha)
+    for col in MONEDAS:
+        st.metric(col, f"${fila[col]:,.2f}")
+
+    st.markdown("#### Gráfico de cotizaciones")
+    monedas_disp = MONEDAS
+    monedas_selec = st.multiselect("Seleccionar monedas a comparar:", monedas_disp, default=monedas_disp)
+    periodo_comp = st.selectbox("Periodo para cotizaciones:", list(VENTANAS.keys()))
+    col1, col2 = st.columns(2)
+    nombre_ventana = col1.selectbox("Ventana de las estadísticas móviles:", list(VENTANAS_MOVILES))
+    con_medias = col2.checkbox("Superponer medias móviles")
+    ventana = VENTANAS_MOVILES[nombre_ventana]
+    df_periodo = tamanio("ventana", serie.ventana(periodo_comp))
+
+    # Las estadísticas se comparten entre sesiones: se alinean por fecha con el periodo elegido
+    fechas = df_periodo["fecha"]
+    columnas = list(monedas_selec)
+    if con_medias:
+        medias = moviles.media(ventana).reindex(fechas)
+        nombres_medias = {m: f"{m} (media {ventana})" for m in monedas_selec}
+        df_periodo = df_periodo.assign(**{nombres_medias[m]: medias[m].to_numpy() for m in monedas_selec})
+        columnas += list(nombres_medias.values())
+
+    with etapa("gráfico cotizaciones"):
+        df_monedas = reducir_series(df_periodo, "fecha", columnas)
+        fig1 = px.line(df_monedas, x="fecha", y="value", color="variable")
+        fig1.update_layout(xaxis_title="", yaxis_title="")
+        st.plotly_chart(fig1, use_container_width=True)
+
+    st.markdown(f"#### Estadísticas móviles ({nombre_ventana})")
+    tabla = moviles.tabla(ventana).loc[MONEDAS]
+    st.dataframe(tabla.style.format("{:,.2f}"))
+
+    st.markdown("#### Brecha USD CCL vs Oficial")
+    with etapa("gráfico brecha"):
+        nombre_ewma = f"EWMA {ventana}"
+        df_brecha = df_periodo.assign(**{nombre_ewma: moviles.ewma(ventana)["Brecha"].reindex(fechas).to_numpy()})
+        df_brecha = reducir_series(df_brecha, "fecha", ["Brecha", nombre_ewma])
+        fig2 = px.line(df_brecha, x="fecha", y="value", color="variable", title="Brecha USD CCL vs Oficial")
+        fig2.update_layout(xaxis_title="", yaxis_title="Brecha (%)", legend_title="")
+        st.plotly_chart(fig2, use_container_width=True)
@@ -0,0 +1,88 @@
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from datos import ACTIVOS_EVOLUCION, _recortar_periodo, alinear_cierres
+from graficos import reducir_series
+from instrumentacion import etapa, tamanio
+from moviles import VENTANAS_MOVILES, EstadisticasMoviles
+from secciones.recursos import obtener_cache_precios
+
+
+@st.cache_data(ttl=900)
+def obtener_historiales_yahoo(tickers, periodo):
+    # Todo el histórico guardado (al menos `periodo`); el periodo se recorta al mostrarlo
+    return obtener_cache_precios().historiales(tickers, periodo, recortar=False)
+
+@st.cache_resource(max_entries=32)
+def obtener_moviles(tickers):
+    # Una por conjunto de activos, sobre el histórico completo y no sobre el periodo:
+    # con un periodo móvil la primera fecha cambia con cada barra y se recalcularía todo
+    return EstadisticasMoviles()
+
+def seccion_evolucion():
+    st.subheader("📈 Evolución de activos")
+    activos = ACTIVOS_EVOLUCION
+
+    seleccion = st.multiselect("Seleccionar activos", list(activos.keys()), default=["Google", "Apple", "Tesla"])
+    periodo = st.selectbox("Elegir periodo", ["7d", "30d", "90d", "180d", "365d", "max"], index=4)
+    col1, col2 = st.columns(2)
+    nombre_ventana = col1.selectbox("Ventana de las estadísticas móviles", list(VENTANAS_MOVILES))
+    con_medias = col2.checkbox("Superponer medias móviles")
+    ventana = VENTANAS_MOVILES[nombre_ventana]
+
+    precios_actuales = {}
+    rendimientos = {}
+
+    # Una sola descarga para todos los activos, ya alineada por fecha
+    tickers = tuple(activos[nombre] for nombre in seleccion)
+    with etapa("históricos"):
+        completos = obtener_historiales_yahoo(tickers, periodo) if tickers else pd.DataFrame()
+    completos = completos.rename(columns={activos[nombre]: nombre for nombre in seleccion}).dropna(axis=1, how="all")
+    cierres = tamanio("cierres", _recortar_periodo(completos, periodo).dropna(axis=1, how="all"))
+
+    if not cierres.empty:
+        df_merged, ultimos, variaciones = alinear_cierres(cierres)
+        precios_actuales = ultimos.to_dict()
+        rendimientos = variaciones.to_dict()
+        with etapa("estadísticas móviles"):
+            moviles = obtener_moviles(tickers).actualizar(completos.ffill())
+
+        columnas = list(cierres.columns)
+        if con_medias:
+            medias = moviles.media(ventana).reindex(df_merged.index)
+            df_merged = df_merged.join(medias.add_suffix(f" (media {ventana})"))
+            columnas += [f"{c} (media {ventana})" for c in cierres.columns]
+
+        df_merged = df_merged.reset_index()
+        # Cada activo se reduce a MAX_PUNTOS antes de pasar a formato largo
+        with etapa("gráfico"):
+            df_melted = tamanio("puntos", reducir_series(df_merged, "Fecha", columnas, var_name="Activo", value_name="Valor"))
+            fig = px.line(df_melted, x="Fecha", y="Valor", color="Activo")
+            fig.update_layout(title="", yaxis_title="", xaxis_title="")
+            st.plotly_chart(fig, use_container_width=True)
+
+        st.markdown(f"#### Estadísticas móviles ({nombre_ventana})")
+        st.dataframe(moviles.tabla(ventana).reindex(cierres.columns).style.format("{:,.2f}"))
+
+        correlacion = moviles.correlacion(ventana).loc[cierres.index[0]:]
+        if not correlacion.empty and correlacion.shape[1]:
+            with etapa("gráfico correlaciones"):
+                df_correlacion = reducir_series(correlacion.rename_axis("Fecha").reset_index(), "Fecha",
+                                                list(correlacion.columns), var_name="Par", value_name="Correlación")
+                fig = px.line(df_correlacion, x="Fecha", y="Correlación", color="Par",
+                              title=f"Correlación móvil de retornos diarios ({nombre_ventana})")
+                fig.update_layout(xaxis_title="", yaxis_range=[-1, 1])
+                st.plotly_chart(fig, use_container_width=True)
+
+    if seleccion:
+        cols = st.columns(len(seleccion))
+        for idx, nombre in enumerate(seleccion):
+            precio = precios_actuales.get(nombre, "-")
+            delta = rendimientos.get(nombre, None)
+            if isinstance(precio, (int, float)) and delta is not None:
+                cols[idx].metric(nombre, f"${precio:,.2f}", f"{delta:+.2f}%")
+            elif isinstance(precio, (int, float)):
+                cols[idx].metric(nombre, f"${precio:,.2f}", "-")
+            else:
+                cols[idx].metric(nombre, "-", "-")
@@ -0,0 +1,203 @@
+import random
+from datetime import datetime
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from dolar import CONVERSIONES
+from graficos import reducir
+from instrumentacion import etapa, tamanio
+from proyeccion import proyectar
+from riesgo import matriz_retornos
+from secciones.recursos import (cargar_dolar, clave_cartera, obtener_cache_precios, obtener_motor_cotizaciones,
+                                obtener_universo, valuar_cartera_cacheada)
+from valuacion import cartera_a_lotes, cierres_cartera, convertir_lotes, convertir_serie, resumen_cartera, valuar_lotes
+
+
+@st.cache_data(ttl=900)
+def proyectar_cartera_cacheada(cartera, dias, caminos, metodo, fecha):
+    # Simula sobre los mismos cierres que arman la evolución histórica del portafolio
+    lotes = cartera_a_lotes([{"Ticker": t, "Fecha": f, "Cantidad": c} for t, f, c in cartera])
+    cierres = cierres_cartera(lotes, obtener_cache_precios())
+    valuados = valuar_lotes(lotes, cierres)
+    if valuados.empty:
+        return pd.DataFrame()
+    pesos = valuados.groupby("Ticker")["Valuación actual"].sum()
+    return proyectar(matriz_retornos(cierres), pesos.sum(), dias=dias, caminos=caminos, metodo=metodo, pesos=pesos)
+
+def seccion_portafolio():
+    st.subheader("📊 Armado de portafolio")
+
+    try:
+        universo = obtener_universo()
+    except FileNotFoundError:
+        st.error("No se encontró el archivo 'assets_yahoo_top100.csv'.")
+        return
+
+    if "cartera" not in st.session_state:
+        st.session_state.cartera = []
+
+    # 🔁 Si no hay cartera, se genera una simulación
+    if not st.session_state.cartera:
+        st.info("Generando cartera simulada de prueba ($150.000)")
+        tickers_sample = universo.tickers[random.sample(range(len(universo)), 5)].tolist()
+        simulated_cartera = []
+        monto_objetivo = 150000
+        monto_actual = 0
+
+        precios_sample = obtener_motor_cotizaciones().instantanea(tickers_sample)["precio"]
+        for ticker in tickers_sample:
+            precio_actual = precios_sample[ticker]
+            if pd.isna(precio_actual) or not precio_actual:
+                continue
+            cantidad = random.randint(1, 10)
+            inversion = precio_actual * cantidad
+            if monto_actual + inversion > monto_objetivo:
+                break
+            simulated_cartera.append({
+                "Ticker": ticker,
+                "Fecha": "2023-01-01",
+                "Cantidad": cantidad
+            })
+            monto_actual += inversion
+
+        st.session_state.cartera = simulated_cartera
+
+    # 🧾 Mostrar cartera actual
+    df_cartera = pd.DataFrame(st.session_state.cartera)
+    if df_cartera.empty:
+        st.info("No se agregaron tenencias aún.")
+        return
+
+    st.markdown("### 🧾 Cartera actual:")
+    for i, row in df_cartera.iterrows():
+        col1, col2, col3, col4, col5 = st.columns([2, 2, 2, 2, 1])
+        col1.write(row["Ticker"])
+        col2.write(row["Fecha"])
+        col3.write(f"{row['Cantidad']}")
+        if col5.button("❌", key=f"delete_{i}"):
+            st.session_state.cartera.pop(i)
+            st.rerun()
+
+
+    # 📈 Formulario para seguir agregando activos manualmente
+    st.markdown("### ➕ Agregar activo a la cartera")
+    # Fuera del formulario: la lista del selectbox se actualiza al escribir
+    busqueda = st.text_input("🔎 Buscar ticker o nombre", key="busqueda_tenencia")
+    with st.form("form_nueva_tenencia", clear_on_submit=True):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            ticker = st.selectbox("Ticker", universo.buscar(busqueda), index=0, format_func=universo.etiqueta)
+        with col2:
+            fecha = st.date_input("Fecha de adquisición", value=pd.to_datetime("2023-01-01"))
+        with col3:
+            cantidad = st.number_input("Cantidad", min_value=0.01, step=1.0)
+        if st.form_submit_button("Agregar a la cartera") and ticker:
+            st.session_state.cartera.append({
+                "Ticker": ticker,
+                "Fecha": str(fecha),
+                "Cantidad": cantidad
+            })
+            st.rerun()
+
+
+    if st.button("🗑️ Limpiar cartera"):
+        st.session_state.cartera = []
+        st.rerun()
+
+
+    # 💰 Cálculos: una consulta de histórico por ticker, cacheada según el contenido de la cartera
+    with etapa("valuación"):
+        valuados, df_hist_total = valuar_cartera_cacheada(clave_cartera(st.session_state.cartera))
+    tamanio("lotes", valuados)
+    tamanio("histórico", df_hist_total)
+
+    # 💱 Los precios están en dólares: se convierten con el tipo de cambio de cada fecha
+    moneda = st.selectbox("Moneda de la valuación", list(CONVERSIONES))
+    simbolo = "$" if moneda == "USD" else f"{moneda} "
+    if moneda != "USD" and not valuados.empty:
+        with etapa("conversión"):
+            serie = cargar_dolar()
+            fecha_actual = df_hist_total.index.max() if not df_hist_total.empty else None
+            valuados = convertir_lotes(valuados, serie, moneda, fecha_actual)
+            df_hist_total = convertir_serie(df_hist_total, serie, moneda)
+        sin_cotizacion = valuados["Valuación inicial"].isna() | valuados["Valuación actual"].isna()
+        if sin_cotizacion.any():
+            st.warning(f"{int(sin_cotizacion.sum())} lote(s) sin cotización {moneda} para su fecha; quedan fuera de los totales.")
+            valuados = valuados[~sin_cotizacion]
+        if not df_hist_total.empty and serie.fecha_max < df_hist_total.index.max():
+            st.caption(f"La serie de cotizaciones llega hasta {serie.fecha_max:%d/%m/%Y}; las fechas posteriores usan ese valor.")
+
+    # 📊 Visualización
+    if not valuados.empty:
+        resumen = resumen_cartera(valuados)
+        st.markdown("### 💼 Valuación total del portafolio")
+        st.success(f"Valuación actual: {simbolo}{resumen['Valuación actual']:,.2f}")
+        st.info(f"Inversión original: {simbolo}{resumen['Inversión original']:,.2f}")
+        st.metric("Rendimiento total", f"{resumen['Rendimiento (%)']:.2f}%")
+        st.metric("Ganancia / Pérdida", f"{simbolo}{resumen['Ganancia / Pérdida']:,.2f}")
+
+        st.markdown("### 📈 Resultados por activo")
+        df_resultados = pd.DataFrame({
+            "Ticker": valuados["Ticker"],
+            "Fecha": valuados["Fecha"].dt.strftime("%Y-%m-%d"),
+            "Cantidad": valuados["Cantidad"],
+            "Precio compra": valuados["Precio compra"].map((simbolo + "{:.2f}").format),
+            "Precio actual": valuados["Precio actual"].map((simbolo + "{:.2f}").format),
+            "Valuación actual": valuados["Valuación actual"].map((simbolo + "{:,.2f}").format),
+            "Rendimiento (%)": valuados["Rendimiento (%)"].map("{:.2f}%".format)
+        })
+        st.dataframe(df_resultados)
+
+        st.markdown("### 📊 Distribución del portafolio")
+        try:
+            fig = px.pie(valuados, names="Ticker", values="Valuación actual", title="Distribución del portafolio")
+            st.plotly_chart(fig, use_container_width=True)
+        except:
+            st.warning("No se pudo generar el gráfico de distribución.")
+
+        st.markdown("### 📉 Evolución histórica del portafolio")
+        if not df_hist_total.empty:
+            total = reducir(df_hist_total.dropna(subset=["Total"]).reset_index(), "Fecha", "Total")
+            st.line_chart(total.set_index("Fecha")["Total"])
+
+        st.markdown("### 🔮 Proyección Monte Carlo (US$)")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            dias = st.slider("Horizonte (ruedas)", min_value=21, max_value=756, value=252, step=21)
+        with col2:
+            caminos = st.selectbox("Escenarios simulados", [10_000, 50_000, 100_000], index=2, format_func="{:,}".format)
+        with col3:
+            # "gbm" simula la cartera como un solo activo; "gbm_activos", cada activo con shocks correlacionados
+            metodo = st.radio("Método", ["bootstrap", "gbm", "gbm_activos"], horizontal=True,
+                              format_func={"bootstrap": "Bootstrap histórico", "gbm": "GBM (cartera)",
+                                           "gbm_activos": "GBM correlacionado por activo"}.get)
+        with etapa("proyección"):
+            proyeccion = proyectar_cartera_cacheada(clave_cartera(st.session_state.cartera), dias, caminos, metodo,
+                                                    datetime.today().date())
+        if not proyeccion.empty:
+            fig = px.line(proyeccion.reset_index(), x="Día", y=list(proyeccion.columns),
+                          title=f"Valuación proyectada a {dias} ruedas (percentiles)")
+            fig.update_layout(yaxis_title="Valuación", legend_title="")
+            st.plotly_chart(fig, use_container_width=True)
+            final = proyeccion.iloc[-1]
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Escenario pesimista (P5)", f"${final['P5']:,.2f}")
+            col2.metric("Mediana (P50)", f"${final['P50']:,.2f}")
+            col3.metric("Escenario optimista (P95)", f"${final['P95']:,.2f}")
+
+    # 📤 Exportación + carga CSV al final
+    csv = pd.DataFrame(st.session_state.cartera).to_csv(index=False).encode("utf-8")
+    st.download_button("📤 Exportar cartera", csv, "cartera.csv", "text/csv")
+
+    st.markdown("### 📥 Cargar cartera desde archivo")
+    archivo = st.file_uploader("Subí tu cartera en CSV", type="csv")
+    if archivo:
+        try:
+            st.session_state.cartera = pd.read_csv(archivo).to_dict(orient="records")
+            st.success("Cartera cargada desde archivo.")
+            st.rerun()
+
+        except Exception as e:
+            st.error(f"Error al cargar el archivo: {e}")
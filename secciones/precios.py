@@ -0,0 +1,141 @@
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from cotizaciones import cambios
+from instrumentacion import etapa, tamanio
+from secciones.recursos import obtener_motor_cotizaciones, obtener_servicio_datos, obtener_universo
+
+NUM_COLS = 3
+# Segundos entre consultas del tablero en vivo; las cotizaciones se renuevan
+# en el proveedor cada 60 segundos, así que intervalos menores sólo aciertan en cache
+INTERVALOS = [15, 30, 60, 120, 300]
+
+
+def _celda(ticker, nombre, fila):
+    # Lo que muestra la métrica de un ticker, para no volver a formatearla si no cambió
+    precio = fila["precio"]
+    cierre = fila["cierre"]
+    if fila["error"]:
+        return ("warning", f"{ticker}: error al consultar ({fila['error']})")
+    if pd.notna(precio) and pd.notna(cierre) and cierre:
+        return ("metric", f"{ticker} - {nombre}", f"${precio:,.2f}", f"{fila['variacion']:+.2f}%")
+    if pd.notna(precio):
+        return ("metric", f"{ticker} - {nombre}", f"${precio:,.2f}", "Variación no disponible")
+    return None
+
+def _mostrar_celdas(celdas):
+    cols = st.columns(NUM_COLS)
+    for idx, celda in enumerate(c for c in celdas if c is not None):
+        with cols[idx % NUM_COLS]:
+            if celda[0] == "warning":
+                st.warning(celda[1])
+            else:
+                st.metric(*celda[1:])
+
+def _top(cotizaciones, universo):
+    # Líneas de los tres mejores y los tres peores del día
+    variaciones = cotizaciones.loc[cotizaciones["error"].isna() & (cotizaciones["cierre"] > 0), "variacion"].dropna()
+    return tuple([f"- {t} ({universo.nombre(t)}): {v:+.2f}%" for t, v in serie.items()]
+                 for serie in (variaciones.nlargest(3), variaciones.nsmallest(3)))
+
+def _mostrar_top(top):
+    gainers, losers = top
+    if gainers:
+        st.markdown("🏆 **Top Gainers:**")
+        st.markdown("\n".join(gainers))
+        st.markdown("📉 **Top Losers:**")
+        st.markdown("\n".join(losers))
+
+def tablero_en_vivo(tickers, universo):
+    """Cuerpo del fragmento del tablero: se vuelve a ejecutar solo cada intervalo, sin el resto de la página.
+
+    Compara la instantánea nueva con la anterior y sólo vuelve a formatear
+    las métricas y el top de los tickers que cambiaron. Streamlit igual
+    vuelve a emitir todos los elementos del fragmento en cada ejecución, así
+    que su costo sigue creciendo con la cantidad de tickers; lo que se evita
+    es volver a ejecutar el resto de la página.
+    """
+    with etapa("tablero"):
+        actual = obtener_motor_cotizaciones().instantanea(tickers)
+    estado = st.session_state.setdefault("tablero", {"instantanea": None, "celdas": {}, "top": ([], [])})
+    cambiados = cambios(estado["instantanea"], actual)
+    for ticker in cambiados:
+        estado["celdas"][ticker] = _celda(ticker, universo.nombre(ticker), actual.loc[ticker])
+    if len(cambiados) or estado["instantanea"] is None or not actual.index.equals(estado["instantanea"].index):
+        estado["top"] = _top(actual, universo)
+    estado["instantanea"] = actual
+
+    _mostrar_celdas(estado["celdas"][t] for t in tickers)
+    _mostrar_top(estado["top"])
+    st.caption(f"🔄 Actualizado {datetime.now():%H:%M:%S}: "
+               f"{len(cambiados)} de {len(tickers)} cotizaciones cambiaron")
+
+def seccion_precios_actuales():
+    st.subheader("📊 Precios actuales de activos")
+
+    try:
+        universo = obtener_universo()
+    except FileNotFoundError:
+        st.error("No se encontró el archivo assets_yahoo_top100.csv.")
+        return
+
+    if "activos" not in st.session_state:
+        st.session_state["activos"] = universo.buscar("", limite=10)
+
+    # Las opciones son los favoritos más los resultados de la búsqueda, no todo el universo
+    busqueda = st.text_input("🔎 Buscar activo por ticker o nombre")
+    opciones = list(dict.fromkeys(st.session_state["activos"] + universo.buscar(busqueda)))
+    seleccionados = st.multiselect("⭐ Elegí tus activos favoritos", options=opciones, default=st.session_state["activos"],
+                                   format_func=universo.etiqueta)
+    st.session_state["activos"] = seleccionados
+
+    tickers = seleccionados
+
+    col1, col2 = st.columns(2)
+    en_vivo = col1.toggle("📡 Tablero en vivo")
+    intervalo = col2.select_slider("Actualizar cada (segundos)", INTERVALOS, value=60, disabled=not en_vivo)
+
+    if en_vivo and tickers:
+        # Sólo el fragmento se vuelve a ejecutar en cada intervalo; el resto de la
+        # sección (búsqueda, selección, exportación) se actualiza con la próxima interacción
+        st.fragment(tablero_en_vivo, run_every=intervalo)(tickers, universo)
+        cotizaciones = st.session_state["tablero"]["instantanea"]
+    else:
+        # Una sola instantánea en paralelo para métricas, info extendida y top gainers/losers
+        with etapa("cotizaciones"):
+            cotizaciones = tamanio("instantánea", obtener_motor_cotizaciones().instantanea(tickers))
+        _mostrar_celdas(_celda(t, universo.nombre(t), cotizaciones.loc[t]) for t in tickers)
+
+    if st.checkbox("📋 Mostrar información extendida (cierre anterior, volumen)"):
+        for ticker, fila in cotizaciones[cotizaciones["error"].isna()].iterrows():
+            cierre = fila["cierre"] if pd.notna(fila["cierre"]) else "N/A"
+            volumen = f"{fila['volumen']:.0f}" if pd.notna(fila["volumen"]) else "N/A"
+            st.text(f"{ticker} - Cierre anterior: ${cierre} | Volumen: {volumen}")
+
+    if tickers:
+        with st.expander("⏱️ Tiempos de consulta"):
+            st.dataframe(cotizaciones[["latencia_ms", "en_cache", "error"]].rename(columns={
+                "latencia_ms": "Latencia (ms)", "en_cache": "Desde cache", "error": "Error"
+            }))
+            estadisticas = obtener_servicio_datos().estadisticas()
+            st.caption(
+                f"Servicio de datos: {estadisticas['aciertos']} aciertos, {estadisticas['fallos']} fallos, "
+                f"{estadisticas['coalescidos']} pedidos agrupados, {estadisticas['limitados']} rechazos por límite, "
+                f"{estadisticas['megabytes']:.1f} MB en cache"
+            )
+
+    if not en_vivo:
+        _mostrar_top(_top(cotizaciones, universo))
+
+    validas = cotizaciones[cotizaciones["error"].isna() & (cotizaciones["cierre"] > 0) & cotizaciones["precio"].notna()]
+    if st.button("📤 Exportar selección a CSV"):
+        df_export = pd.DataFrame({
+            "Ticker": validas.index,
+            "Nombre": [universo.nombre(t) for t in validas.index],
+            "Precio actual": validas["precio"].to_numpy(),
+            "Cierre anterior": validas["cierre"].to_numpy(),
+            "Variación (%)": validas["variacion"].to_numpy(),
+        })
+        st.download_button("Descargar CSV", df_export.to_csv(index=False), "precios_activos.csv", "text/csv")
@@ -0,0 +1,50 @@
+"""Recursos compartidos por varias secciones: una instancia por proceso o por cartera."""
+import streamlit as st
+
+from cache_precios import CachePrecios
+from cotizaciones import MotorCotizaciones
+from datos import proveedor_por_defecto
+from ingesta_dolar import AlmacenDolar
+from servicio_datos import ServicioDatos
+from universo import UniversoActivos
+from valuacion import valuar_cartera
+
+
+@st.cache_resource
+def obtener_servicio_datos():
+    # Un solo proveedor por proceso: agrupa los pedidos simultáneos de todas las sesiones
+    return ServicioDatos(proveedor_por_defecto())
+
+@st.cache_resource
+def obtener_universo():
+    # Se carga e indexa una sola vez por proceso; las búsquedas no recorren la lista
+    return UniversoActivos.desde_csv("assets_yahoo_top100.csv")
+
+@st.cache_resource
+def obtener_almacen_dolar():
+    # Se arma con valores_limpio.csv la primera vez (y otra vez si el CSV se edita); después crece con ingesta_dolar.py
+    return AlmacenDolar.desde_csv("valores_limpio.csv")
+
+def cargar_dolar():
+    # La usan la sección del dólar y la valuación en otras monedas; cada rerun
+    # incorpora los segmentos agregados desde la última lectura
+    return obtener_almacen_dolar().serie()
+
+@st.cache_resource
+def obtener_cache_precios():
+    # Históricos persistidos en disco: sólo se descargan las barras nuevas
+    return CachePrecios(obtener_servicio_datos())
+
+@st.cache_resource
+def obtener_motor_cotizaciones():
+    # Compartido entre sesiones: la cache de cotizaciones dura 60 segundos
+    return MotorCotizaciones(obtener_servicio_datos())
+
+def clave_cartera(cartera):
+    # Representación inmutable de la cartera para usarla como clave de cache
+    return tuple((row["Ticker"], str(row["Fecha"]), float(row["Cantidad"])) for row in cartera)
+
+@st.cache_data(ttl=900)
+def valuar_cartera_cacheada(cartera):
+    lotes = [{"Ticker": t, "Fecha": f, "Cantidad": c} for t, f, c in cartera]
+    return valuar_cartera(lotes, obtener_cache_precios())
@@ -0,0 +1,97 @@
+from collections import defaultdict
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from instrumentacion import etapa, tamanio
+from secciones.recursos import obtener_servicio_datos
+from titulares import FUENTES, TEMA_GENERAL, AlmacenTitulares
+
+
+@st.cache_resource
+def obtener_almacen_titulares():
+    # Titulares persistidos en disco; los feeds se consultan cada 10 minutos como máximo
+    return AlmacenTitulares(FUENTES, proveedor=obtener_servicio_datos())
+
+def seccion_titulares():
+    st.subheader("📰 Titulares económicos")
+
+    fuentes = list(FUENTES.keys())
+    st.caption(f"🗞️ Fuente: {', '.join(fuentes)}")
+
+    try:
+        almacen = obtener_almacen_titulares()
+        with etapa("feeds"):
+            almacen.actualizar_si_corresponde()
+        df_titulares = tamanio("titulares", almacen.recientes(fuentes, cantidad=20))
+
+        # Validación de resultados
+        if df_titulares.empty:
+            errores = [almacen.error(f) for f in fuentes if almacen.error(f)]
+            st.warning(f"No se pudieron cargar titulares desde {', '.join(fuentes)}.")
+            for error in errores:
+                st.caption(error)
+            return
+
+        noticias = []
+        agrupadas = defaultdict(list)
+        resumen_temas = defaultdict(int)
+
+        for entry in df_titulares.itertuples():
+            fecha_formateada = entry.fecha.strftime("%d/%m/%Y %H:%M hs") if pd.notna(entry.fecha) else entry.fecha_texto
+            etiquetas = entry.temas.split(", ")
+            for et in etiquetas:
+                if et != TEMA_GENERAL:
+                    resumen_temas[et] += 1
+                agrupadas[et].append({
+                    "titulo": entry.titulo,
+                    "link": entry.link,
+                    "fecha": fecha_formateada
+                })
+
+            noticias.append({
+                "Título": entry.titulo,
+                "Fecha": fecha_formateada,
+                "Fuente": entry.fuente,
+                "Enlace": entry.link,
+                "Temas": entry.temas
+            })
+
+        # RESUMEN automático del día
+        st.markdown("### 🧠 Síntesis del día")
+        temas_ordenados = sorted(resumen_temas.items(), key=lambda x: x[1], reverse=True)
+        if temas_ordenados:
+            st.markdown("Hoy se destacaron:\n")
+            for tema, cantidad in temas_ordenados:
+                st.markdown(f"- {tema}: {cantidad} titulares")
+        else:
+            st.markdown("*No se detectaron temas destacados.*")
+
+        # FILTRO por tema
+        todos_los_temas = list(agrupadas.keys())
+        seleccionados = st.multiselect("📌 Filtrar por tema", todos_los_temas, default=todos_los_temas)
+
+        # MOSTRAR NOTICIAS agrupadas por tema
+        for categoria in seleccionados:
+            st.markdown(f"## {categoria}")
+            for noticia in agrupadas[categoria]:
+                st.markdown(f"""
+                    <div style='padding: 1rem; border-radius: 12px; background-color: #1e1e1e; margin-bottom: 1rem;'>
+                        <a href="{noticia['link']}" target="_blank" style="text-decoration: none;">
+                            <h4 style='margin-bottom: 0.3rem; color: #4FC3F7;'>{noticia['titulo']}</h4>
+                        </a>
+                        <p style='color: gray; font-size: 0.9rem;'>🗓️ {noticia['fecha']}</p>
+                    </div>
+                """, unsafe_allow_html=True)
+
+        # EXPORTACIÓN
+        df_noticias = pd.DataFrame(noticias)
+        st.download_button("📤 Descargar titulares como CSV", df_noticias.to_csv(index=False), "titulares.csv", "text/csv")
+
+        # FECHA de última actualización
+        ultima = almacen.ultima_consulta(fuentes) or datetime.now()
+        st.caption(f"🕒 Última actualización: {ultima.strftime('%d/%m/%Y %H:%M')}")
+
+    except Exception as e:
+        st.error(f"Error al cargar noticias: {str(e)}")
@@ -0,0 +1,170 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+import instrumentacion
+
+# Segundos que vale cada tipo de pedido dentro de la cache compartida
+TTL = {"historiales": 900, "ohlc": 900, "cotizacion": 60}
+MAX_BYTES = 256 * 1024 ** 2
+SENIALES_LIMITE = ("too many requests", "rate limit", "ratelimit", "429")
+
+
+def es_limite(error):
+    # yfinance levanta YFRateLimitError; otros clientes sólo dejan el 429 en el mensaje
+    texto = f"{type(error).__name__} {error}".lower()
+    return any(senial in texto for senial in SENIALES_LIMITE)
+
+
+def tamanio(valor):
+    """Bytes aproximados que ocupa un resultado (DataFrames, dicts de DataFrames u otros)."""
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(deep=True).sum())
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(deep=True))
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamanio(k) + tamanio(v) for k, v in valor.items())
+    return sys.getsizeof(valor)
+
+
+class _Vuelo:
+    # Pedido en curso al proveedor: los demás hilos esperan su resultado
+    def __init__(self):
+        self.listo = threading.Event()
+        self.valor = None
+        self.error = None
+
+
+class ServicioDatos:
+    """Proveedor compartido por todas las sesiones que evita pedidos repetidos.
+
+    Envuelve a ProveedorYahoo o ProveedorLocal con la misma interfaz
+    (historiales, ohlc, cotizacion, feed). Los pedidos idénticos que llegan al
+    mismo tiempo se resuelven con una sola llamada al proveedor; los
+    resultados se guardan con TTL por tipo de pedido y se desalojan los
+    menos usados cuando la cache supera `max_bytes`. Si el proveedor
+    responde que se superó el límite de pedidos, todas las llamadas esperan
+    un tiempo que se duplica en cada rechazo consecutivo.
+
+    Los resultados se comparten entre sesiones: no deben modificarse.
+    """
+
+    def __init__(self, proveedor, ttl=TTL, max_bytes=MAX_BYTES, espera_inicial=2.0, espera_maxima=120.0):
+        self.proveedor = proveedor
+        self.ttl = dict(TTL, **ttl)
+        self.max_bytes = max_bytes
+        self.espera_inicial = espera_inicial
+        self.espera_maxima = espera_maxima
+        self._cache = OrderedDict()
+        self._vuelos = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._espera = 0.0
+        self._pausa_hasta = 0.0
+        self.contadores = dict.fromkeys(["aciertos", "fallos", "coalescidos", "llamadas", "errores", "limitados", "desalojos"], 0)
+
+    def _guardar(self, clave, valor, ahora):
+        peso = tamanio(valor)
+        if peso > self.max_bytes:
+            return
+        if clave in self._cache:
+            self._bytes -= self._cache.pop(clave)[2]
+        self._cache[clave] = (ahora + self.ttl[clave[0]], valor, peso)
+        self._bytes += peso
+        while self._bytes > self.max_bytes:
+            _, (_, _, liberado) = self._cache.popitem(last=False)
+            self._bytes -= liberado
+            self.contadores["desalojos"] += 1
+
+    def _llamar(self, metodo, args):
+        # Los contadores y el backoff se comparten entre hilos: se tocan sólo bajo el lock
+        with self._lock:
+            pausa = self._pausa_hasta - time.monotonic()
+            self.contadores["llamadas"] += 1
+        if pausa > 0:
+            time.sleep(pausa)
+        inicio = time.perf_counter()
+        try:
+            valor = getattr(self.proveedor, metodo)(*args)
+        except Exception as e:
+            instrumentacion.llamada(metodo, (time.perf_counter() - inicio) * 1000, type(e).__name__)
+            with self._lock:
+                self.contadores["errores"] += 1
+                if es_limite(e):
+                    # Backoff global: el límite del proveedor es por IP, no por sesión
+                    self.contadores["limitados"] += 1
+                    self._espera = min(self.espera_maxima, self._espera * 2 or self.espera_inicial)
+                    self._pausa_hasta = time.monotonic() + self._espera
+            raise
+        instrumentacion.llamada(metodo, (time.perf_counter() - inicio) * 1000)
+        with self._lock:
+            self._espera = 0.0
+        return valor
+
+    def _pedir(self, metodo, *args):
+        clave = (metodo,) + args
+        with self._lock:
+            ahora = time.monotonic()
+            guardado = self._cache.get(clave)
+            if guardado and guardado[0] > ahora:
+                self._cache.move_to_end(clave)
+                self.contadores["aciertos"] += 1
+                instrumentacion.cache("servicio_datos", "acierto")
+                return guardado[1]
+            vuelo = self._vuelos.get(clave)
+            lider = vuelo is None
+            if lider:
+                vuelo = self._vuelos[clave] = _Vuelo()
+                self.contadores["fallos"] += 1
+            else:
+                self.contadores["coalescidos"] += 1
+        instrumentacion.cache("servicio_datos", "fallo" if lider else "agrupado")
+
+        if not lider:
+            vuelo.listo.wait()
+            if vuelo.error is not None:
+                raise vuelo.error
+            return vuelo.valor
+
+        try:
+            vuelo.valor = self._llamar(metodo, args)
+        except Exception as e:
+            # Los errores no se guardan, pero sí se comparten con quienes esperaban
+            vuelo.error = e
+            raise
+        else:
+            with self._lock:
+                self._guardar(clave, vuelo.valor, time.monotonic())
+        finally:
+            with self._lock:
+                del self._vuelos[clave]
+            vuelo.listo.set()
+        return vuelo.valor
+
+    def historiales(self, tickers, periodo):
+        return self._pedir("historiales", tuple(dict.fromkeys(tickers)), periodo)
+
+    def ohlc(self, tickers, inicio=None, periodo=None):
+        inicio = None if inicio is None else pd.Timestamp(inicio)
+        return self._pedir("ohlc", tuple(dict.fromkeys(tickers)), inicio, periodo)
+
+    def cotizacion(self, ticker):
+        return self._pedir("cotizacion", ticker)
+
+    def feed(self, url, etag=None, modified=None):
+        # Sin cache: la respuesta depende del ETag de quien pregunta, pero respeta el backoff
+        return self._llamar("feed", (url, etag, modified))
+
+    def estadisticas(self):
+        with self._lock:
+            pedidos = self.contadores["aciertos"] + self.contadores["fallos"] + self.contadores["coalescidos"]
+            return dict(
+                self.contadores,
+                entradas=len(self._cache),
+                megabytes=self._bytes / 1024 ** 2,
+                tasa_aciertos=(self.contadores["aciertos"] + self.contadores["coalescidos"]) / pedidos if pedidos else 0.0,
+                espera_s=max(0.0, self._pausa_hasta - time.monotonic()),
+            )
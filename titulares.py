@@ -0,0 +1,268 @@
+import json
+import os
+import re
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from datos import ProveedorYahoo
+
+FUENTES = {
+    "El Cronista": "https://www.cronista.com/files/rss/finanzas.xml",
+}
+
+# Clasificación por tema
+TEMAS = {
+    "📈 Inflación": ["inflación", "ipc", "precios"],
+    "💵 Tipo de cambio": ["dólar", "blue", "cambiario"],
+    "🌾 Commodities": ["soja", "petróleo", "commodities"],
+    "🏦 Política monetaria": ["bcra", "tasa", "interviene", "liquidez"],
+    "⚠️ Alerta": ["crisis", "default", "caída", "récord"]
+}
+TEMA_GENERAL = "📄 General"
+
+DIRECTORIO_CACHE = ".cache_titulares"
+COLUMNAS = ["link", "titulo", "fecha", "fecha_texto", "fuente", "temas", "ingresado"]
+
+
+SIN_TILDES = str.maketrans("áàéèíìóòúùüñ", "aaeeiioouuun")
+VARIANTES = {"a": "aáà", "e": "eéè", "i": "iíì", "o": "oóò", "u": "uúùü", "n": "nñ"}
+
+
+def _normalizar(palabra):
+    return palabra.lower().translate(SIN_TILDES)
+
+
+def _tolerante(palabra):
+    # "dolar" -> "d[oóò]l[aáà]r": coincide con o sin tilde sin normalizar el texto
+    return "".join(f"[{VARIANTES[c]}]" if c in VARIANTES else re.escape(c) for c in palabra)
+
+
+def _trie(palabras):
+    # Alternancia en forma de árbol de prefijos: la regex no reintenta cada
+    # palabra clave desde cero en cada posición del texto
+    ramas = {}
+    fin = False
+    for palabra in palabras:
+        if palabra:
+            ramas.setdefault(palabra[0], []).append(palabra[1:])
+        else:
+            fin = True
+    if not ramas:
+        return ""
+    partes = [_tolerante(letra) + _trie(restos) for letra, restos in sorted(ramas.items())]
+    patron = partes[0] if len(partes) == 1 else "(?:" + "|".join(partes) + ")"
+    return f"(?:{patron})?" if fin else patron
+
+
+class ClasificadorTemas:
+    """Asigna temas a titulares con una sola expresión regular compilada.
+
+    Todas las palabras clave de `temas` se unen en un patrón insensible a
+    mayúsculas y tildes, con límites de palabra (admite plurales: "tasas" sí,
+    "tasación" no). `clasificar_lote` une los titulares en un único texto y
+    lo recorre una sola vez; el resto es aritmética de arrays.
+    """
+
+    def __init__(self, temas=TEMAS):
+        self.temas = list(temas)
+        self.ids = {}
+        for i, palabras in enumerate(temas.values()):
+            for palabra in palabras:
+                self.ids.setdefault(_normalizar(palabra), []).append(i)
+        self.patron = re.compile(r"\n|\b" + _trie(self.ids) + r"(?:es|s)?\b")
+
+    def _categorias(self, coincidencia):
+        palabra = _normalizar(coincidencia)
+        for candidata in (palabra, palabra[:-2], palabra[:-1]):
+            if candidata in self.ids:
+                return self.ids[candidata]
+        return []
+
+    def clasificar_lote(self, titulos):
+        """Lista de temas por titular, en el orden de `temas` (o [TEMA_GENERAL])."""
+        titulos = ["" if not isinstance(t, str) else t.replace("\n", " ") for t in titulos]
+        resultado = [[TEMA_GENERAL] for _ in titulos]
+        encontradas = self.patron.findall("\n".join(titulos).lower())
+        if len(encontradas) <= len(titulos) - 1:
+            # Sólo saltos de línea: ningún titular tiene palabras clave
+            return resultado
+
+        codigos, unicas = pd.factorize(np.array(encontradas, dtype=object))
+        es_salto = (unicas == "\n")[codigos]
+        titular = np.cumsum(es_salto)[~es_salto]
+        codigos = codigos[~es_salto]
+
+        # Cada coincidencia distinta puede pertenecer a más de un tema
+        categorias = [[] if u == "\n" else self._categorias(u) for u in unicas]
+        if len(self.temas) < 63:
+            # Temas de cada titular como máscara de bits: un OR por coincidencia
+            bits = np.array([sum(1 << i for i in c) for c in categorias], dtype=np.int64)
+            mascaras = np.zeros(len(titulos), dtype=np.int64)
+            np.bitwise_or.at(mascaras, titular, bits[codigos])
+            con_temas = np.flatnonzero(mascaras)
+            combinaciones = {m: [t for i, t in enumerate(self.temas) if m >> i & 1] for m in np.unique(mascaras[con_temas]).tolist()}
+            for t, m in zip(con_temas.tolist(), mascaras[con_temas].tolist()):
+                resultado[t] = combinaciones[m]
+            return resultado
+
+        # Taxonomías grandes: pares (titular, tema) únicos ordenados
+        pares = sorted({(t, i) for t, codigo in zip(titular.tolist(), codigos.tolist()) for i in categorias[codigo]})
+        agrupados = {}
+        for t, i in pares:
+            agrupados.setdefault(t, []).append(self.temas[i])
+        for t, temas in agrupados.items():
+            resultado[t] = temas
+        return resultado
+
+    def clasificar(self, titulo):
+        return self.clasificar_lote([titulo])[0]
+
+
+CLASIFICADOR = ClasificadorTemas(TEMAS)
+
+
+def clasificar(titulo, clasificador=CLASIFICADOR):
+    return clasificador.clasificar(titulo)
+
+
+def _fecha_entrada(entry):
+    try:
+        return datetime(*entry.published_parsed[:6])
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class AlmacenTitulares:
+    """Titulares de uno o más feeds RSS guardados en disco y deduplicados por enlace.
+
+    Cada feed se consulta a través del `proveedor` (ProveedorYahoo por
+    defecto) con ETag/Last-Modified, así que si no cambió el servidor
+    responde 304 y no se procesa nada. Sólo las entradas nuevas se
+    clasifican y se agregan al almacén; la UI filtra sobre lo guardado.
+    """
+
+    def __init__(self, fuentes=FUENTES, directorio=DIRECTORIO_CACHE, intervalo=pd.Timedelta(minutes=10),
+                 clasificador=CLASIFICADOR, proveedor=None):
+        self.fuentes = dict(fuentes)
+        self.proveedor = proveedor if proveedor is not None else ProveedorYahoo()
+        self.clasificador = clasificador
+        self.intervalo = intervalo
+        self._lock = threading.Lock()
+        self._ruta = os.path.join(directorio, "titulares.parquet") if directorio else None
+        self._ruta_estado = os.path.join(directorio, "feeds.json") if directorio else None
+        self.estado = {}
+        self.titulares = pd.DataFrame(columns=COLUMNAS)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+            try:
+                with open(self._ruta_estado) as f:
+                    self.estado = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                pass
+            if os.path.exists(self._ruta):
+                self.titulares = pd.read_parquet(self._ruta)
+
+    def _guardar(self, con_titulares=True):
+        if not self._ruta:
+            return
+        if con_titulares:
+            self.titulares.to_parquet(f"{self._ruta}.tmp")
+            os.replace(f"{self._ruta}.tmp", self._ruta)
+        with open(f"{self._ruta_estado}.tmp", "w") as f:
+            json.dump(self.estado, f, indent=1)
+        os.replace(f"{self._ruta_estado}.tmp", self._ruta_estado)
+
+    def actualizar(self, fuente):
+        """Consulta un feed y agrega sus entradas nuevas. Devuelve cuántas se agregaron."""
+        url = self.fuentes[fuente]
+        estado = self.estado.get(fuente, {})
+        feed = self.proveedor.feed(url, etag=estado.get("etag"), modified=estado.get("modified"))
+        ahora = pd.Timestamp.now()
+        estado = dict(estado, consultado=ahora.isoformat(), status=getattr(feed, "status", None))
+        if getattr(feed, "etag", None):
+            estado["etag"] = feed.etag
+        if getattr(feed, "modified", None):
+            estado["modified"] = feed.modified
+        if feed.bozo and not feed.entries:
+            estado["error"] = str(getattr(feed, "bozo_exception", "feed inválido"))
+        else:
+            estado.pop("error", None)
+
+        with self._lock:
+            conocidos = set(self.titulares["link"])
+            nuevos = []
+            for entry in feed.entries:
+                enlace = entry.get("link")
+                if not enlace or enlace in conocidos:
+                    continue
+                conocidos.add(enlace)
+                titulo = entry.get("title", "")
+                nuevos.append({
+                    "link": enlace,
+                    "titulo": titulo,
+                    "fecha": _fecha_entrada(entry),
+                    "fecha_texto": entry.get("published", ""),
+                    "fuente": fuente,
+                    "temas": None,
+                    "ingresado": ahora,
+                })
+            if nuevos:
+                bloque = pd.DataFrame(nuevos, columns=COLUMNAS)
+                bloque["temas"] = [", ".join(t) for t in self.clasificador.clasificar_lote(bloque["titulo"])]
+                bloque["fecha"] = pd.to_datetime(bloque["fecha"])
+                self.titulares = bloque if self.titulares.empty else pd.concat([self.titulares, bloque], ignore_index=True)
+            self.estado[fuente] = estado
+            self._guardar(con_titulares=bool(nuevos))
+        return len(nuevos)
+
+    def importar_csv(self, ruta="titulares.csv", fuente="Archivo"):
+        """Carga titulares históricos (columnas titulo, fecha, url) clasificándolos en un solo lote."""
+        df = pd.read_csv(ruta)
+        with self._lock:
+            df = df[~df["url"].isin(self.titulares["link"])].drop_duplicates("url")
+            if df.empty:
+                return 0
+            bloque = pd.DataFrame({
+                "link": df["url"].to_numpy(),
+                "titulo": df["titulo"].to_numpy(),
+                "fecha": pd.NaT,
+                "fecha_texto": df["fecha"].astype(str).to_numpy(),
+                "fuente": fuente,
+                "temas": [", ".join(t) for t in self.clasificador.clasificar_lote(df["titulo"])],
+                "ingresado": pd.Timestamp.now(),
+            }, columns=COLUMNAS)
+            self.titulares = bloque if self.titulares.empty else pd.concat([self.titulares, bloque], ignore_index=True)
+            self._guardar()
+        return len(bloque)
+
+    def reclasificar(self):
+        # Vuelve a etiquetar todo el almacén, por ejemplo después de cambiar TEMAS
+        with self._lock:
+            self.titulares["temas"] = [", ".join(t) for t in self.clasificador.clasificar_lote(self.titulares["titulo"])]
+            self._guardar()
+
+    def actualizar_si_corresponde(self, fuentes=None):
+        # Sólo consulta los feeds cuya última consulta tiene más de `intervalo`
+        ahora = pd.Timestamp.now()
+        for fuente in fuentes or self.fuentes:
+            consultado = self.estado.get(fuente, {}).get("consultado")
+            if consultado is None or ahora - pd.Timestamp(consultado) >= self.intervalo:
+                self.actualizar(fuente)
+
+    def recientes(self, fuentes=None, cantidad=20):
+        df = self.titulares
+        if fuentes is not None:
+            df = df[df["fuente"].isin(fuentes)]
+        orden = df["fecha"].fillna(df["ingresado"])
+        return df.loc[orden.sort_values(ascending=False).index].groupby("fuente", group_keys=False).head(cantidad)
+
+    def ultima_consulta(self, fuentes=None):
+        consultas = [self.estado.get(f, {}).get("consultado") for f in fuentes or self.fuentes]
+        consultas = [pd.Timestamp(c) for c in consultas if c]
+        return max(consultas) if consultas else None
+
+    def error(self, fuente):
+        return self.estado.get(fuente, {}).get("error")
@@ -0,0 +1,128 @@
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+# Resultados por búsqueda que se le pasan a los widgets
+LIMITE = 50
+# Fracción mínima de los trigramas de la consulta que debe tener un activo
+# para aparecer en la búsqueda aproximada
+SIMILITUD_MINIMA = 0.5
+
+
+def _normalizar(texto):
+    # Minúsculas y sin tildes: "Société Générale" -> "societe generale"
+    texto = unicodedata.normalize("NFKD", str(texto).lower())
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+def _trigramas(texto):
+    texto = f" {texto} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class UniversoActivos:
+    """Tickers y nombres de todos los activos con índices de búsqueda precalculados.
+
+    Los datos quedan en arrays de NumPy en el orden recibido (por nombre).
+    La búsqueda por prefijo usa un array ordenado de claves (el ticker y
+    cada palabra del nombre, normalizados) y searchsorted; si no alcanza,
+    se completa con una búsqueda aproximada por trigramas. Ninguna consulta
+    recorre el universo entero en Python.
+    """
+
+    def __init__(self, tickers, nombres):
+        self.tickers = np.asarray(tickers, dtype=str)
+        self.nombres = np.asarray(nombres, dtype=str)
+        self._posicion = {t: i for i, t in enumerate(self.tickers.tolist())}
+        normalizados = [_normalizar(t) for t in self.tickers.tolist()]
+        self._tickers_norm = np.asarray(normalizados, dtype=str)
+
+        claves, ids, de_ticker = [], [], []
+        postings = defaultdict(list)
+        self._cantidad_trigramas = np.empty(len(self.tickers), dtype=np.int32)
+        for i, (ticker, nombre) in enumerate(zip(normalizados, self.nombres.tolist())):
+            nombre = _normalizar(nombre)
+            palabras = set(nombre.split()) - {ticker}
+            claves += [ticker, *palabras]
+            ids += [i] * (1 + len(palabras))
+            de_ticker += [True] + [False] * len(palabras)
+            trigramas = _trigramas(f"{ticker} {nombre}")
+            self._cantidad_trigramas[i] = len(trigramas)
+            for trigrama in trigramas:
+                postings[trigrama].append(i)
+
+        claves = np.asarray(claves, dtype=str)
+        orden = np.argsort(claves, kind="stable")
+        self._claves = claves[orden]
+        self._ids = np.asarray(ids, dtype=np.int32)[orden]
+        self._de_ticker = np.asarray(de_ticker)[orden]
+        self._postings = {g: np.asarray(v, dtype=np.int32) for g, v in postings.items()}
+
+    @classmethod
+    def desde_csv(cls, ruta="assets_yahoo_top100.csv"):
+        df = pd.read_csv(ruta, usecols=["Ticker", "Nombre"], dtype=str).dropna(subset=["Ticker"])
+        df = df.drop_duplicates("Ticker").sort_values("Nombre", kind="stable")
+        return cls(df["Ticker"].to_numpy(), df["Nombre"].fillna(df["Ticker"]).to_numpy())
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def nombre(self, ticker):
+        i = self._posicion.get(ticker)
+        return ticker if i is None else str(self.nombres[i])
+
+    def etiqueta(self, ticker):
+        # format_func de los widgets: las opciones son tickers, se muestra "TICKER - Nombre"
+        return f"{ticker} - {self.nombre(ticker)}"
+
+    def _por_prefijo(self, palabra):
+        inicio = np.searchsorted(self._claves, palabra, side="left")
+        fin = np.searchsorted(self._claves, palabra + "\U0010ffff", side="left")
+        return self._ids[inicio:fin], self._de_ticker[inicio:fin]
+
+    def _prefijos(self, consulta):
+        """Activos en los que cada palabra de la consulta es prefijo del ticker o de una
+        palabra del nombre, primero el ticker exacto, después los tickers y luego los nombres."""
+        palabras = consulta.split()
+        ids, de_ticker = self._por_prefijo(palabras[0])
+        for palabra in palabras[1:]:
+            otros, _ = self._por_prefijo(palabra)
+            mascara = np.isin(ids, otros)
+            ids, de_ticker = ids[mascara], de_ticker[mascara]
+        prioridad = np.where(de_ticker, np.where(self._tickers_norm[ids] == consulta, 0, 1), 2)
+        orden = np.lexsort((ids, prioridad))
+        ids = ids[orden]
+        _, primeros = np.unique(ids, return_index=True)
+        return ids[np.sort(primeros)]
+
+    def _aproximados(self, consulta, limite):
+        trigramas = _trigramas(consulta)
+        listas = [self._postings[g] for g in trigramas if g in self._postings]
+        if not listas:
+            return np.empty(0, dtype=np.int32)
+        comunes = np.bincount(np.concatenate(listas), minlength=len(self.tickers))
+        candidatos = np.flatnonzero(comunes)
+        similitud = comunes[candidatos] / len(trigramas)
+        elegidos = similitud >= SIMILITUD_MINIMA
+        candidatos, similitud = candidatos[elegidos], similitud[elegidos]
+        if len(candidatos) > limite:
+            mejores = np.argpartition(-similitud, limite)[:limite]
+            candidatos, similitud = candidatos[mejores], similitud[mejores]
+        # A igual similitud van primero los textos más cortos (coincidencia más ajustada)
+        return candidatos[np.lexsort((candidatos, self._cantidad_trigramas[candidatos], -similitud))]
+
+    def buscar(self, consulta, limite=LIMITE):
+        """Hasta `limite` tickers para la consulta (ticker o nombre, admite errores de tipeo).
+
+        Sin consulta devuelve los primeros activos por nombre.
+        """
+        consulta = _normalizar(consulta).strip()
+        if not consulta:
+            return self.tickers[:limite].tolist()
+        ids = self._prefijos(consulta)[:limite]
+        if len(ids) < limite and len(consulta) >= 3:
+            extra = self._aproximados(consulta, limite)
+            ids = np.concatenate([ids, extra[~np.isin(extra, ids)]])[:limite]
+        return self.tickers[ids].tolist()
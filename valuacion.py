@@ -0,0 +1,203 @@
+import numpy as np
+import pandas as pd
+
+
+def cartera_a_lotes(cartera):
+    # Lista de dicts (Ticker, Fecha, Cantidad) como la guarda st.session_state.cartera
+    lotes = pd.DataFrame(list(cartera), columns=["Ticker", "Fecha", "Cantidad"])
+    lotes["Fecha"] = pd.to_datetime(lotes["Fecha"]).dt.normalize()
+    lotes["Cantidad"] = lotes["Cantidad"].astype(float)
+    return lotes
+
+
+def cierres_cartera(lotes, historial):
+    """Una consulta por ticker distinto, desde su fecha de compra más antigua.
+
+    `historial` es cualquier objeto con historial(ticker, inicio=...), por
+    ejemplo CachePrecios. Devuelve los cierres en formato ancho (fecha x ticker).
+    """
+    inicios = lotes.groupby("Ticker")["Fecha"].min()
+    cierres = {}
+    for ticker, inicio in inicios.items():
+        try:
+            barras = historial.historial(ticker, inicio=inicio)
+        except Exception:
+            continue
+        if barras is not None and not barras.empty:
+            cierres[ticker] = barras["Close"]
+    if not cierres:
+        return pd.DataFrame()
+    df = pd.concat(cierres, axis=1).sort_index()
+    df.index.name = "Fecha"
+    return df
+
+
+def valuar_lotes(lotes, cierres):
+    """Precio de compra, precio actual, valuación y rendimiento de cada lote.
+
+    El precio de compra es el primer cierre dentro de los 5 días posteriores
+    a la fecha de adquisición. Los lotes sin precios quedan afuera. Cada
+    lote se identifica ("Lote") con su etiqueta en el índice de `lotes`, así
+    que las partes de una misma tabla se pueden valuar por separado y unir.
+    """
+    if lotes.empty or cierres.empty:
+        return lotes.iloc[0:0].rename_axis("Lote").assign(**{c: pd.Series(dtype=float) for c in
+                                         ["Precio compra", "Precio actual", "Valuación inicial",
+                                          "Valuación actual", "Rendimiento (%)"]})
+
+    # Sin NaN: en pandas 3 stack() los conserva y merge_asof tomaría la fila vacía
+    largo = cierres.stack(future_stack=True).dropna().rename("Precio compra").reset_index()
+    largo.columns = ["Fecha", "Ticker", "Precio compra"]
+    lotes = lotes.rename_axis("Lote").reset_index()
+    valuados = pd.merge_asof(
+        lotes.sort_values("Fecha"), largo.sort_values("Fecha"),
+        on="Fecha", by="Ticker", direction="forward", tolerance=pd.Timedelta(days=4)
+    ).sort_values("Lote")
+
+    ultimos = cierres.ffill().iloc[-1]
+    valuados["Precio actual"] = valuados["Ticker"].map(ultimos)
+    valuados = valuados.dropna(subset=["Precio compra", "Precio actual"])
+    valuados["Valuación inicial"] = valuados["Precio compra"] * valuados["Cantidad"]
+    valuados["Valuación actual"] = valuados["Precio actual"] * valuados["Cantidad"]
+    valuados["Rendimiento (%)"] = (valuados["Precio actual"] / valuados["Precio compra"] - 1) * 100
+    return valuados.set_index("Lote")
+
+
+def _serie_desde_cierres(cierres, lotes):
+    cierres = cierres.sort_index().ffill()
+    fechas = cierres.index
+    compras = lotes.pivot_table(index="Fecha", columns="Ticker", values="Cantidad", aggfunc="sum")
+    compras = compras.reindex(columns=compras.columns.intersection(cierres.columns))
+    # Cantidad en cartera de cada ticker en cada fecha; una compra en un día sin
+    # cotización empieza a contar desde la rueda siguiente
+    cantidades = compras.reindex(fechas.union(compras.index)).fillna(0).cumsum().reindex(fechas).to_numpy()
+    precios = cierres[compras.columns].to_numpy()
+    valores = np.where(cantidades > 0, cantidades * precios, np.nan)
+    con_tenencia = ~np.isnan(valores).all(axis=1)
+    valores = valores[con_tenencia]
+    total = np.nansum(valores, axis=1)
+    return pd.DataFrame(
+        np.column_stack([valores, total]),
+        index=fechas[con_tenencia],
+        columns=list(compras.columns) + ["Total"],
+    )
+
+
+def serie_cartera(precios, lotes):
+    """Valuación diaria de cada posición (una columna por ticker) y el Total.
+
+    `precios` es una tabla larga con columnas Fecha, Ticker y Close; `lotes`
+    tiene Ticker, Fecha y Cantidad (puede repetir tickers). Todo se resuelve
+    con un pivot, una multiplicación y una suma, sin importar cuántos lotes haya.
+    """
+    if lotes.empty or precios.empty:
+        return pd.DataFrame(columns=["Total"])
+    precios = precios[precios["Ticker"].isin(lotes["Ticker"].unique())]
+    cierres = precios.drop_duplicates(["Fecha", "Ticker"], keep="last").pivot(index="Fecha", columns="Ticker", values="Close")
+    return _serie_desde_cierres(cierres, lotes)
+
+
+def valuar_cartera(cartera, historial):
+    """Devuelve (lotes valuados, histórico diario) a partir de una sola consulta por ticker."""
+    lotes = cartera_a_lotes(cartera)
+    cierres = cierres_cartera(lotes, historial)
+    valuados = valuar_lotes(lotes, cierres)
+    if valuados.empty:
+        return valuados, pd.DataFrame(columns=["Total"])
+    historico = _serie_desde_cierres(cierres, valuados[["Ticker", "Fecha", "Cantidad"]])
+    return valuados, historico
+
+
+def convertir_lotes(valuados, serie_dolar, destino, fecha_actual=None):
+    """Lotes valuados expresados en `destino` (una clave de dolar.CONVERSIONES).
+
+    El precio de compra se convierte al tipo de cambio de la fecha de
+    adquisición y el actual al de `fecha_actual` (por defecto, la última
+    cotización de la serie), así el rendimiento incluye la variación de la
+    moneda. Todos los lotes se resuelven con un solo join as-of.
+    """
+    if valuados.empty:
+        return valuados
+    fecha_actual = serie_dolar.fecha_max if fecha_actual is None else fecha_actual
+    compra = serie_dolar.factores(destino, valuados["Fecha"])
+    actual = serie_dolar.factores(destino, [fecha_actual])[0]
+    convertidos = valuados.copy()
+    convertidos["Precio compra"] = valuados["Precio compra"] * compra
+    convertidos["Precio actual"] = valuados["Precio actual"] * actual
+    convertidos["Valuación inicial"] = convertidos["Precio compra"] * convertidos["Cantidad"]
+    convertidos["Valuación actual"] = convertidos["Precio actual"] * convertidos["Cantidad"]
+    convertidos["Rendimiento (%)"] = (convertidos["Precio actual"] / convertidos["Precio compra"] - 1) * 100
+    return convertidos
+
+
+def convertir_serie(historico, serie_dolar, destino):
+    """Histórico diario (índice de fechas) expresado en `destino`, cada día a su tipo de cambio."""
+    if historico.empty:
+        return historico
+    return historico.mul(serie_dolar.factores(destino, historico.index), axis=0)
+
+
+# Reglas de las alertas automatizadas
+UMBRAL_CONCENTRACION = 30
+UMBRAL_PERDIDA = -20
+UMBRAL_RENDIMIENTO_BAJO = 5
+
+
+def resumen_cartera(valuados):
+    total_actual = valuados["Valuación actual"].sum()
+    total_invertido = valuados["Valuación inicial"].sum()
+    delta = (total_actual / total_invertido - 1) * 100 if total_invertido > 0 else 0
+    return {
+        "Valuación actual": total_actual,
+        "Inversión original": total_invertido,
+        "Rendimiento (%)": delta,
+        "Ganancia / Pérdida": total_actual - total_invertido,
+    }
+
+
+def resumen_carteras(valuados):
+    """resumen_cartera de muchas carteras a la vez: una fila por valor de la columna Cartera."""
+    grupos = valuados.groupby("Cartera")
+    total_actual = grupos["Valuación actual"].sum()
+    total_invertido = grupos["Valuación inicial"].sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = np.where(total_invertido > 0, (total_actual / total_invertido - 1) * 100, 0)
+    return pd.DataFrame({
+        "Valuación actual": total_actual,
+        "Inversión original": total_invertido,
+        "Rendimiento (%)": delta,
+        "Ganancia / Pérdida": total_actual - total_invertido,
+    })
+
+
+def alertas_carteras(valuados, resumen=None):
+    """Las reglas de alertas_cartera aplicadas a todas las carteras con operaciones por grupo.
+
+    Devuelve una fila por alerta con Cartera, Tipo, Ticker y Valor (%).
+    """
+    resumen = resumen_carteras(valuados) if resumen is None else resumen
+    porcentaje = valuados["Valuación actual"] / valuados.groupby("Cartera")["Valuación actual"].transform("sum") * 100
+    concentrados = valuados[porcentaje > UMBRAL_CONCENTRACION]
+    perdedores = valuados[valuados["Rendimiento (%)"] < UMBRAL_PERDIDA]
+    bajos = resumen[resumen["Rendimiento (%)"] < UMBRAL_RENDIMIENTO_BAJO]
+    partes = [
+        pd.DataFrame({"Cartera": concentrados["Cartera"], "Tipo": "Concentración mayor al 30%",
+                      "Ticker": concentrados["Ticker"], "Valor (%)": porcentaje[concentrados.index]}),
+        pd.DataFrame({"Cartera": perdedores["Cartera"], "Tipo": "Caída mayor al 20%",
+                      "Ticker": perdedores["Ticker"], "Valor (%)": perdedores["Rendimiento (%)"]}),
+        pd.DataFrame({"Cartera": bajos.index, "Tipo": "Rendimiento total inferior al 5%",
+                      "Ticker": "", "Valor (%)": bajos["Rendimiento (%)"].to_numpy()}),
+    ]
+    return pd.concat(partes, ignore_index=True).sort_values(["Cartera", "Tipo"], kind="stable", ignore_index=True)
+
+
+def alertas_cartera(valuados):
+    """Lotes con más del 30% de la cartera, lotes con caídas mayores al 20% y
+    si el rendimiento total quedó por debajo del 5%."""
+    resumen = resumen_cartera(valuados)
+    porcentaje = valuados["Valuación actual"] / resumen["Valuación actual"] * 100
+    return {
+        "concentrados": valuados[porcentaje > UMBRAL_CONCENTRACION].assign(**{"% cartera": porcentaje}),
+        "perdedores": valuados[valuados["Rendimiento (%)"] < UMBRAL_PERDIDA],
+        "rendimiento_bajo": resumen["Rendimiento (%)"] < UMBRAL_RENDIMIENTO_BAJO,
+    }